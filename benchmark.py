@@ -1,57 +1,332 @@
+import argparse
+import json
 import os
+import platform
 import random
+import sys
+import time
 from concurrent.futures import ProcessPoolExecutor, as_completed
-from functools import partial
+from typing import Callable
 
-from wordle import game, words
+from wordle import game, instrumentation, simulation, words
+from wordle.instrumentation import percentiles
 
-if os.name == "nt":
-    clear_screen = partial(os.system, "cls")
-else:
-    clear_screen = partial(os.system, "clear")
+try:
+    import resource
+except ImportError:
+    resource = None
 
+# game states (solution, guesses) spanning a range of candidate set sizes
+RANKING_STATES = (
+    ("CIGAR", ("FUZZY",)),
+    ("CIGAR", ("FUZZY", "WHOMP")),
+    ("CIGAR", ("QAJAQ",)),
+    ("CIGAR", ("CLOTH",)),
+    ("CIGAR", ("CLOTH", "DUMPY")),
+)
 
-def simulate_game(solution: str) -> list[str]:
+LOWER_IS_BETTER = ("mean", "p50", "p95", "p99", "peak_rss_mb")
+HIGHER_IS_BETTER = ("games_per_second",)
+
+
+def peak_rss_mb() -> float | None:
+    if resource is None:
+        return None
+
+    peak = max(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    )
+
+    # linux reports kilobytes, macos reports bytes
+    return peak / (1024**2 if sys.platform == "darwin" else 1024)
+
+
+def measure(
+    fn: Callable[[], object],
+    *,
+    budget: float = 1.0,
+    min_calls: int = 5,
+) -> dict[str, float]:
+    samples = []
+    started_at = time.perf_counter()
+    while len(samples) < min_calls or time.perf_counter() - started_at < budget:
+        call_started_at = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - call_started_at)
+
+    return percentiles(samples)
+
+
+def state(solution: str, guesses: tuple[str, ...], **kwargs: object) -> game.Game:
+    g = game.Game(solution, **kwargs)
+    for guess in guesses:
+        g.make_guess(guess)
+    return g
+
+
+def micro_benchmarks(budget: float) -> dict[str, dict[str, float]]:
+    rng = random.Random(0)
+    pairs = [
+        (rng.choice(words.all_words_list), rng.choice(words.solutions_list))
+        for _ in range(1000)
+    ]
+    g = game.Game("CIGAR")
+    guesses = [g._evaluate_guess(guess, solution=s) for guess, s in pairs]
+
+    def evaluate_guess() -> None:
+        for guess, solution in pairs:
+            g._evaluate_guess(guess, solution=solution)
+
+    def filter_words() -> None:
+        for guess in guesses:
+            game.WordFilter.DEFAULT.filter(guess)
+
+    def narrow() -> None:
+        for guess in guesses:
+            game.WordFilter.DEFAULT.narrow(guess)
+
+    results = {
+        "evaluate_guess x1000": measure(evaluate_guess, budget=budget),
+        "filter x1000": measure(filter_words, budget=budget),
+        "narrow x1000": measure(narrow, budget=budget),
+    }
+
+    for solution, guesses_made in RANKING_STATES:
+        g = state(solution, guesses_made, multiprocessing_disabled=True)
+        pruned = state(
+            solution,
+            guesses_made,
+            multiprocessing_disabled=True,
+            pruning=True,
+        )
+
+        size = len(g.possible_solutions)
+        results[f"get_guess_rankings n={size}"] = measure(
+            g.get_guess_rankings,
+            budget=budget,
+        )
+        results[f"best_guess (pruned) n={size}"] = measure(
+            lambda: pruned.best_guess,
+            budget=budget,
+        )
+
+        # one extra call shows where a ranking spends its time
+        with instrumentation.recording():
+            results[f"get_guess_rankings n={size}"]["stats"] = (
+                g.get_guess_rankings().stats
+            )
+
+    return results
+
+
+def simulate_game(solution: str) -> tuple[list[str], list[float], dict]:
     g = game.Game(solution, multiprocessing_disabled=True)
-    while not g.won and not g.lost:
-        g.make_guess(g.best_guess)
-    return [guess.word for guess in g.guesses]
+    latencies = []
+    with instrumentation.recording() as stats:
+        while not g.won and not g.lost:
+            started_at = time.perf_counter()
+            guess = g.best_guess
+            latencies.append(time.perf_counter() - started_at)
+            g.make_guess(guess)
+    return [guess.word for guess in g.guesses], latencies, stats.as_dict()
+
+
+def macro_benchmark(processes: int, limit: int | None) -> dict[str, object]:
+    solutions = words.solutions_list.copy()
+    random.Random(0).shuffle(solutions)
+    solutions = solutions[:limit]
+
+    successes = 0
+    successful_guesses = 0
+    latencies: list[float] = []
+    stats = instrumentation.Stats()
+
+    started_at = time.perf_counter()
+    with ProcessPoolExecutor(processes) as e:
+        futures = {
+            e.submit(simulate_game, solution): solution for solution in solutions
+        }
+        for attempts, future in enumerate(as_completed(futures), 1):
+            solution = futures[future]
+            guesses, turn_latencies, game_stats = future.result()
+            latencies.extend(turn_latencies)
+            stats.update(game_stats)
+
+            if guesses[-1] == solution:
+                successful_guesses += len(guesses)
+                successes += 1
+
+            print(
+                f"\r{attempts} / {len(solutions)} games"
+                ", "
+                f"Average Guesses: {successful_guesses / max(successes, 1):.3f}"
+                ", "
+                f"Success Rate: {successes / attempts:.2%}",
+                end="",
+                file=sys.stderr,
+            )
+
+    elapsed = time.perf_counter() - started_at
+    print(file=sys.stderr)
+
+    return {
+        "games": len(solutions),
+        "processes": processes,
+        "seconds": elapsed,
+        "games_per_second": len(solutions) / elapsed,
+        "success_rate": successes / len(solutions),
+        "average_guesses": successful_guesses / max(successes, 1),
+        "turn_latency": percentiles(latencies),
+        "peak_rss_mb": peak_rss_mb(),
+        "stats": stats.as_dict(),
+    }
+
+
+def batch_benchmark(limit: int | None) -> dict[str, object]:
+    solutions = words.solutions_list[:limit]
+    transpositions = simulation.TranspositionTable()
+
+    started_at = time.perf_counter()
+    with instrumentation.recording() as stats:
+        results = simulation.simulate_all(solutions, transpositions=transpositions)
+    elapsed = time.perf_counter() - started_at
+
+    won = [guesses for solution, guesses in results.items() if guesses[-1] == solution]
+    return {
+        "games": len(solutions),
+        "seconds": elapsed,
+        "games_per_second": len(solutions) / elapsed,
+        "success_rate": len(won) / len(solutions),
+        "average_guesses": sum(map(len, won)) / max(len(won), 1),
+        "rankings": transpositions.misses,
+        "transposition_hits": transpositions.hits,
+        "peak_rss_mb": peak_rss_mb(),
+        "stats": stats.as_dict(),
+    }
+
+
+def flatten(report: dict, prefix: str = "") -> dict[str, float]:
+    flat = {}
+    for key, value in report.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat |= flatten(value, f"{name}.")
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[name] = value
+    return flat
+
+
+def compare(baseline: dict, current: dict, tolerance: float) -> list[str]:
+    regressions = []
+    old, new = flatten(baseline), flatten(current)
+    for name in sorted(old.keys() & new.keys()):
+        metric = name.rsplit(".", 1)[-1]
+        if not old[name]:
+            continue
+
+        change = (new[name] - old[name]) / old[name]
+        if (metric in LOWER_IS_BETTER and change > tolerance) or (
+            metric in HIGHER_IS_BETTER and change < -tolerance
+        ):
+            regressions.append(
+                f"{name}: {old[name]:.6g} -> {new[name]:.6g} ({change:+.1%})",
+            )
+
+    return regressions
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Benchmark the word guessing solver.",
+    )
+    subparsers = parser.add_subparsers(dest="command")
+
+    for name, help_text in (
+        ("run", "Run the micro benchmarks and the full game simulation."),
+        ("micro", "Time individual solver operations."),
+        ("macro", "Simulate a game for every solution."),
+        ("batch", "Simulate every solution at once, sharing work between games."),
+    ):
+        subparser = subparsers.add_parser(name, help=help_text)
+        subparser.add_argument(
+            "--output",
+            type=str,
+            default="",
+            help="Write the JSON report to this file instead of stdout.",
+        )
+        subparser.add_argument(
+            "--budget",
+            type=float,
+            default=1.0,
+            help="Seconds to spend on each micro benchmark.",
+        )
+        subparser.add_argument(
+            "--processes",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="How many processes to simulate games with.",
+        )
+        subparser.add_argument(
+            "--limit",
+            type=int,
+            default=None,
+            help="Only simulate this many solutions.",
+        )
+
+    compare_parser = subparsers.add_parser(
+        "compare",
+        help="Flag regressions between two JSON reports.",
+    )
+    compare_parser.add_argument("baseline", type=str)
+    compare_parser.add_argument("current", type=str)
+    compare_parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.10,
+        help="Relative change allowed before a metric counts as a regression.",
+    )
+
+    return parser
+
+
+def main() -> None:
+    ns = build_parser().parse_args()
+    if ns.command is None:
+        ns = build_parser().parse_args(["run"])
+
+    if ns.command == "compare":
+        with open(ns.baseline) as f:
+            baseline = json.load(f)
+        with open(ns.current) as f:
+            current = json.load(f)
+
+        regressions = compare(baseline, current, ns.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if not regressions:
+            print("No regressions.")
+        sys.exit(1 if regressions else 0)
+
+    report: dict[str, object] = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+    if ns.command in ("run", "micro"):
+        report["micro"] = micro_benchmarks(ns.budget)
+    if ns.command in ("run", "macro"):
+        report["macro"] = macro_benchmark(ns.processes, ns.limit)
+    if ns.command == "batch":
+        report["batch"] = batch_benchmark(ns.limit)
+
+    output = json.dumps(report, indent=2)
+    if ns.output:
+        with open(ns.output, "w") as f:
+            f.write(output)
+    else:
+        print(output)
 
 
 if __name__ == "__main__":
-    with ProcessPoolExecutor(16) as e:
-        solutions = words.solutions_list.copy()
-        random.shuffle(solutions)
-
-        try:
-            successes = 0
-            successful_guesses = 0
-
-            futures = {
-                e.submit(simulate_game, solution): solution for solution in solutions
-            }
-            print(f"Submitted {len(futures)} futures.")
-
-            for attempts, future in enumerate(as_completed(futures), 1):
-                solution = futures.pop(future)
-                guesses = future.result()
-
-                g = game.Game(solution, multiprocessing_disabled=True)
-                for guess in guesses:
-                    g.make_guess(guess)
-
-                if g.won:
-                    successful_guesses += len(guesses)
-                    successes += 1
-
-                clear_screen()
-                print(g)
-                print(
-                    f"Average Guesses: {successful_guesses / successes:.3f}"
-                    ", "
-                    f"Success Rate: {successes} / {attempts} = {successes / attempts:.2%}",
-                )
-        except:
-            print("shutting down...", end="\r")
-            e.shutdown(cancel_futures=True)
-            raise
+    main()
@@ -1,3 +1,3 @@
 from wordle import cli
 
-cli.play()
+cli.main()
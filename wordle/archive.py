@@ -0,0 +1,167 @@
+import json
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Iterator
+
+from wordle.cache import cache_directory
+
+# the fetch path can be pointed elsewhere, such as a local stand-in server
+NYT_URL = "https://www.nytimes.com/svc/wordle/v2/{day}.json"
+FIRST_DAY = date(2021, 6, 19)
+
+
+class SolutionArchive:
+    def __init__(self, path: Path | None = None) -> None:
+        self.path = path or cache_directory() / "nyt-solutions.sqlite3"
+        self._lock = threading.Lock()
+
+        self._connection = sqlite3.connect(
+            self.path,
+            timeout=30,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS solutions ("
+            " day TEXT PRIMARY KEY,"
+            " solution TEXT NOT NULL,"
+            " data TEXT NOT NULL"
+            ")",
+        )
+
+    def __enter__(self) -> "SolutionArchive":
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def __contains__(self, day: date) -> bool:
+        return self.get(day) is not None
+
+    def get(self, day: date) -> str | None:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT solution FROM solutions WHERE day = ?",
+                (day.isoformat(),),
+            ).fetchone()
+
+        return row[0] if row else None
+
+    def put(self, day: date, data: dict[str, Any]) -> str:
+        solution = data["solution"].strip().upper()
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO solutions VALUES (?, ?, ?)",
+                (day.isoformat(), solution, json.dumps(data, separators=(",", ":"))),
+            )
+
+        return solution
+
+    def items(self) -> Iterator[tuple[date, str]]:
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT day, solution FROM solutions ORDER BY day",
+            ).fetchall()
+
+        for day, solution in rows:
+            yield date.fromisoformat(day), solution
+
+
+def session(workers: int = 8, retries: int = 3, backoff: float = 0.5) -> Any:
+    # only needed when fetching, and slow to import
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    s = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=workers,
+        pool_maxsize=workers,
+        max_retries=Retry(
+            total=retries,
+            backoff_factor=backoff,
+            status_forcelist=(429, 500, 502, 503, 504),
+        ),
+    )
+    s.mount("http://", adapter)
+    s.mount("https://", adapter)
+    return s
+
+
+def fetch(day: date, *, url: str = NYT_URL, http: Any = None) -> dict[str, Any]:
+    # a session of our own is closed again, a caller's is left open
+    if http is None:
+        with session() as http:
+            return fetch(day, url=url, http=http)
+
+    response = http.get(url.format(day=day.isoformat()), timeout=30)
+    response.raise_for_status()
+    return response.json()
+
+
+def solution(
+    day: date,
+    *,
+    archive: SolutionArchive | None = None,
+    url: str = NYT_URL,
+) -> str:
+    if archive is None:
+        with SolutionArchive() as archive:
+            return solution(day, archive=archive, url=url)
+
+    if (archived := archive.get(day)) is not None:
+        return archived
+
+    return archive.put(day, fetch(day, url=url))
+
+
+def backfill(
+    start: date = FIRST_DAY,
+    end: date | None = None,
+    *,
+    archive: SolutionArchive | None = None,
+    url: str = NYT_URL,
+    workers: int = 8,
+    retries: int = 3,
+) -> tuple[int, dict[date, str]]:
+    if archive is None:
+        with SolutionArchive() as archive:
+            return backfill(
+                start,
+                end,
+                archive=archive,
+                url=url,
+                workers=workers,
+                retries=retries,
+            )
+
+    end = end or date.today()
+
+    days = [
+        start + timedelta(days=i)
+        for i in range((end - start).days + 1)
+        if start + timedelta(days=i) not in archive
+    ]
+
+    fetched = 0
+    failures: dict[date, str] = {}
+    http = session(workers, retries)
+    with http, ThreadPoolExecutor(workers) as e:
+        futures = {e.submit(fetch, day, url=url, http=http): day for day in days}
+        for future in as_completed(futures):
+            day = futures[future]
+            try:
+                archive.put(day, future.result())
+            except Exception as error:
+                failures[day] = repr(error)
+            else:
+                fetched += 1
+
+    return fetched, failures
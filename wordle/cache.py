@@ -0,0 +1,110 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+
+def cache_directory() -> Path:
+    if override := os.environ.get("WORDLE_CACHE_DIR"):
+        path = Path(override)
+    elif os.name == "nt":
+        path = (
+            Path(os.environ.get("LOCALAPPDATA") or Path.home() / "AppData" / "Local")
+            / "wordle-bot"
+        )
+    else:
+        path = (
+            Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache")
+            / "wordle-bot"
+        )
+
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+class RankingCache:
+    def __init__(
+        self,
+        path: Path | None = None,
+        *,
+        max_bytes: int = 64 * 1024 * 1024,
+    ) -> None:
+        self.path = path or cache_directory() / "rankings.sqlite3"
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+        # autocommit mode, transactions are opened explicitly where needed
+        self._connection = sqlite3.connect(
+            self.path,
+            timeout=30,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS rankings ("
+            " key TEXT PRIMARY KEY,"
+            " value BLOB NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " used_at REAL NOT NULL"
+            ")",
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS rankings_used_at ON rankings (used_at)",
+        )
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def get(self, key: str) -> dict | None:
+        with self._transaction():
+            row = self._connection.execute(
+                "SELECT value FROM rankings WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+
+            self._connection.execute(
+                "UPDATE rankings SET used_at = ? WHERE key = ?",
+                (time.time(), key),
+            )
+
+        return json.loads(zlib.decompress(row[0]))
+
+    def put(self, key: str, value: dict) -> None:
+        blob = zlib.compress(json.dumps(value, separators=(",", ":")).encode())
+
+        with self._transaction():
+            self._connection.execute(
+                "INSERT OR REPLACE INTO rankings VALUES (?, ?, ?, ?)",
+                (key, blob, len(blob), time.time()),
+            )
+
+            # drop the least recently used entries beyond the size limit
+            self._connection.execute(
+                "DELETE FROM rankings WHERE key IN ("
+                " SELECT key FROM ("
+                "  SELECT key, SUM(size) OVER (ORDER BY used_at DESC) AS total"
+                "  FROM rankings"
+                " ) WHERE total > ?"
+                ")",
+                (self.max_bytes,),
+            )
+
+    @contextmanager
+    def _transaction(self) -> Iterator[None]:
+        with self._lock:
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                yield
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+                raise
+            else:
+                self._connection.execute("COMMIT")
@@ -1,8 +1,28 @@
 import argparse
+import json
 import os
+import sys
+from contextlib import ExitStack
+from datetime import date
 from functools import partial
+from pathlib import Path
+from typing import Sequence
 
-from wordle import game, words
+import colorama
+
+from wordle import (
+    archive,
+    cache,
+    decisions,
+    distributed,
+    evaluation,
+    executors,
+    game,
+    grids,
+    instrumentation,
+    openings,
+    words,
+)
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -46,6 +66,204 @@ def build_parser() -> argparse.ArgumentParser:
         default=-1,
         help="How much time to spend searching for the best word, if any.",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Disable reusing word suggestions from previous runs.",
+    )
+    parser.add_argument(
+        "--hard-mode",
+        action="store_true",
+        help="Require every revealed hint to be used in later guesses.",
+    )
+    parser.add_argument(
+        "--executor",
+        choices=executors.BACKENDS,
+        default=executors.AUTO,
+        help="Where to search for the best word, chosen by problem size by default.",
+    )
+    parser.add_argument(
+        "--nodes",
+        type=str,
+        default="",
+        help="Search on these worker nodes instead (comma separated host:port).",
+    )
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="Show where the time went while searching for the best word.",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Profile each word search and print the most expensive calls.",
+    )
+
+    subparsers = parser.add_subparsers(dest="command")
+
+    openings_parser = subparsers.add_parser(
+        "openings",
+        help="Generate the first and second turn guess rankings.",
+    )
+    openings_parser.add_argument(
+        "--openers",
+        type=int,
+        default=5,
+        help="How many of the best first guesses to rank second guesses for.",
+    )
+    openings_parser.add_argument(
+        "--depth",
+        type=int,
+        default=25,
+        help="How many second guesses to keep for each feedback pattern.",
+    )
+
+    subparsers.add_parser(
+        "decision-tree",
+        help="Precompute the best guess for every reachable game state.",
+    )
+
+    evaluate_parser = subparsers.add_parser(
+        "evaluate",
+        help="Play every solution headlessly, resuming an interrupted run.",
+    )
+    evaluate_parser.add_argument(
+        "output",
+        type=Path,
+        help="The JSON lines file to stream results to (and resume from).",
+    )
+    evaluate_parser.add_argument(
+        "--processes",
+        type=int,
+        default=0,
+        help="How many games to play at once.",
+    )
+    evaluate_parser.add_argument(
+        "--limit",
+        type=int,
+        default=None,
+        help="Only play this many solutions.",
+    )
+    evaluate_parser.add_argument(
+        "--solutions",
+        type=Path,
+        default=None,
+        help="Read the solutions from this file, one word per line.",
+    )
+    evaluate_parser.add_argument(
+        "--non-solutions",
+        type=Path,
+        default=None,
+        help="Read the non-solutions from this file, one word per line.",
+    )
+    evaluate_parser.add_argument(
+        "--nyt-archive",
+        action="store_true",
+        help="Play the archived daily answers (see backfill) in date order.",
+    )
+    evaluate_parser.add_argument(
+        "--summary",
+        action="store_true",
+        help="Only summarize the results already in the output file.",
+    )
+
+    backfill_parser = subparsers.add_parser(
+        "backfill",
+        help="Download the daily answers into the local archive.",
+    )
+    backfill_parser.add_argument(
+        "--start",
+        type=date.fromisoformat,
+        default=archive.FIRST_DAY,
+        help="The first day to fetch (YYYY-MM-DD).",
+    )
+    backfill_parser.add_argument(
+        "--end",
+        type=date.fromisoformat,
+        default=None,
+        help="The last day to fetch (YYYY-MM-DD), today by default.",
+    )
+    backfill_parser.add_argument(
+        "--workers",
+        type=int,
+        default=8,
+        help="How many days to fetch at once.",
+    )
+    backfill_parser.add_argument(
+        "--retries",
+        type=int,
+        default=3,
+        help="How many times to retry a failed request.",
+    )
+    backfill_parser.add_argument(
+        "--url",
+        type=str,
+        default=archive.NYT_URL,
+        help="Where to fetch each day from, with {day} standing in for the date.",
+    )
+
+    serve_parser = subparsers.add_parser(
+        "serve",
+        help="Answer best guess queries over HTTP.",
+    )
+    serve_parser.add_argument(
+        "--host",
+        type=str,
+        default="127.0.0.1",
+        help="The address to listen on.",
+    )
+    serve_parser.add_argument(
+        "--port",
+        type=int,
+        default=8765,
+        help="The port to listen on.",
+    )
+    serve_parser.add_argument(
+        "--unix-socket",
+        type=str,
+        default="",
+        help="Listen on this UNIX socket instead of a TCP port.",
+    )
+
+    grids_parser = subparsers.add_parser(
+        "grids",
+        help="Find the answers consistent with shared result grids.",
+    )
+    grids_parser.add_argument(
+        "grids",
+        type=Path,
+        nargs="*",
+        help="Files holding one shared grid each, read from stdin by default.",
+    )
+    grids_parser.add_argument(
+        "--limit",
+        type=int,
+        default=20,
+        help="How many of the most plausible answers to show.",
+    )
+
+    worker_parser = subparsers.add_parser(
+        "worker",
+        help="Rank shards of guesses for a coordinator using --nodes.",
+    )
+    worker_parser.add_argument(
+        "--host",
+        type=str,
+        default="127.0.0.1",
+        help="The address to listen on.",
+    )
+    worker_parser.add_argument(
+        "--port",
+        type=int,
+        default=8766,
+        help="The port to listen on.",
+    )
+    worker_parser.add_argument(
+        "--delay",
+        type=float,
+        default=0.0,
+        help="Wait this long before each shard, to stand in for a slow node.",
+    )
 
     return parser
 
@@ -59,7 +277,15 @@ def configured_play(
     letter_bank: bool = True,
     word_bank_size: int = -1,
     word_search_timeout: float = -1,
+    ranking_cache: bool = True,
+    stats: bool = False,
+    profile: bool = False,
+    executor: str = executors.AUTO,
+    hard_mode: bool = False,
+    nodes: Sequence[str] = (),
 ) -> None:
+    colorama.init()
+
     if clear_screen:
         if os.name == "nt":
             separate_game_screens = partial(os.system, "cls")
@@ -72,7 +298,15 @@ def configured_play(
         print("Fetching the word of the day...")
         solution = words.fetch_nyt_solution()
 
-    g = game.Game(solution, enforce_guess_validity=enforce_guess_validity)
+    g = game.Game(
+        solution,
+        enforce_guess_validity=enforce_guess_validity,
+        executor=distributed.DistributedExecutor(nodes) if nodes else executor,
+        hard_mode=hard_mode,
+        ranking_cache=(
+            cache.RankingCache() if ranking_cache and word_search_timeout > 0 else None
+        ),
+    )
     separate_game_screens()
 
     while True:
@@ -86,7 +320,17 @@ def configured_play(
 
         if word_search_timeout > 0:
             print("Waiting...", end="", flush=True)
-            print("\rSuggestion:", g.get_guess_rankings(word_search_timeout))
+            with ExitStack() as stack:
+                if stats:
+                    stack.enter_context(instrumentation.recording())
+                if profile:
+                    stack.enter_context(instrumentation.profiling())
+
+                suggestion = g.get_guess_rankings(word_search_timeout)
+
+            print("\rSuggestion:", suggestion)
+            if suggestion.stats:
+                print(instrumentation.format_stats(suggestion.stats))
 
         if g.guesses:
             print(g)
@@ -119,8 +363,84 @@ def play_from_namespace(ns: argparse.Namespace) -> None:
         letter_bank=not ns.no_letter_bank,
         word_bank_size=ns.word_bank,
         word_search_timeout=ns.word_suggestion,
+        ranking_cache=not ns.no_cache,
+        stats=ns.stats,
+        profile=ns.profile,
+        executor=ns.executor,
+        hard_mode=ns.hard_mode,
+        nodes=[node for node in ns.nodes.split(",") if node],
     )
 
 
 def play() -> None:
     return play_from_namespace(build_parser().parse_args())
+
+
+def main() -> None:
+    ns = build_parser().parse_args()
+
+    if ns.command == "openings":
+        openings.generate(ns.openers, ns.depth)
+        print(f"Wrote {openings.initial_path} and {openings.second_path}")
+    elif ns.command == "decision-tree":
+        decisions.build(game.Game())
+        print(f"Wrote {decisions.path}")
+    elif ns.command == "evaluate":
+        if not ns.summary:
+            options = {"hard_mode": ns.hard_mode}
+            for name, path in (
+                ("solutions", ns.solutions),
+                ("non_solutions", ns.non_solutions),
+            ):
+                if path is not None:
+                    options[name] = sorted(set(path.read_text().split()))
+                    # every worker (and every resumed run) reuses the tables
+                    options["persist_indexes"] = True
+
+            if ns.nyt_archive:
+                # answers repeat, but each one only needs to be played once
+                with archive.SolutionArchive() as solution_archive:
+                    answers = list(
+                        dict.fromkeys(s for _, s in solution_archive.items()),
+                    )
+            else:
+                answers = sorted(options.get("solutions", words.solutions))
+
+            evaluation.evaluate(
+                answers[: ns.limit],
+                ns.output,
+                processes=ns.processes or None,
+                **options,
+            )
+
+        print(json.dumps(evaluation.summarize(ns.output), indent=2))
+    elif ns.command == "backfill":
+        fetched, failures = archive.backfill(
+            ns.start,
+            ns.end,
+            url=ns.url,
+            workers=ns.workers,
+            retries=ns.retries,
+        )
+        for day, error in sorted(failures.items()):
+            print(f"{day}: {error}")
+        print(f"Fetched {fetched} days, {len(failures)} failed.")
+    elif ns.command == "serve":
+        # asyncio is only worth importing when serving
+        from wordle import server
+
+        server.run(
+            ns.host,
+            ns.port,
+            ns.unix_socket or None,
+            ranking_cache=not ns.no_cache,
+        )
+    elif ns.command == "grids":
+        texts = [path.read_text() for path in ns.grids] or [sys.stdin.read()]
+        candidates = grids.solutions(texts)
+        print(f"{len(candidates)} possible answers")
+        print(" ".join(candidates[: ns.limit]))
+    elif ns.command == "worker":
+        distributed.serve_worker(ns.host, ns.port, delay=ns.delay)
+    else:
+        play_from_namespace(ns)
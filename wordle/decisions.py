@@ -0,0 +1,74 @@
+import json
+from collections import defaultdict
+from functools import cache
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable
+
+from wordle import feedback, words
+
+if TYPE_CHECKING:
+    from wordle.game import Game
+
+path = Path(__file__).parent / "decision-tree.json"
+
+
+def _walk(game: "Game", solutions: list[str]) -> dict:
+    guess = game.best_guess
+    node: dict = {"guess": guess}
+
+    buckets: defaultdict[int, list[str]] = defaultdict(list)
+    for solution in solutions:
+        buckets[feedback.pattern(guess, solution)].append(solution)
+
+    children = {}
+    for pattern, bucket in sorted(buckets.items()):
+        if pattern == feedback.SOLVED:
+            continue
+
+        child = game.with_solution(bucket[0])
+        child.make_guess(guess)
+        children[str(pattern)] = _walk(child, bucket)
+
+    if children:
+        node["next"] = children
+
+    return node
+
+
+def build(root: "Game") -> dict:
+    tree = _walk(root, sorted(root.possible_solutions))
+
+    with path.open("w") as f:
+        json.dump(
+            {"key": words.digest(words.solutions, words.non_solutions), "tree": tree},
+            f,
+            separators=(",", ":"),
+        )
+
+    load.cache_clear()
+    return tree
+
+
+@cache
+def load() -> dict | None:
+    try:
+        with path.open() as f:
+            data = json.load(f)
+    except Exception:
+        return None
+
+    if data.get("key") != words.digest(words.solutions, words.non_solutions):
+        return None
+
+    return data["tree"]
+
+
+def lookup(history: Iterable[tuple[str, int]]) -> str | None:
+    node = load()
+    for word, pattern in history:
+        if node is None or node["guess"] != word:
+            return None
+
+        node = node.get("next", {}).get(str(pattern))
+
+    return node["guess"] if node is not None else None
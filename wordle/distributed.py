@@ -0,0 +1,336 @@
+import json
+import math
+import socket
+import socketserver
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Iterable
+
+import numpy as np
+
+from wordle import feedback, game, ranking, words
+from wordle.executors import Ranked
+from wordle.feedback import PatternTable
+
+# every message is a 4 byte big-endian length followed by that much JSON
+HEADER_SIZE = 4
+
+
+def send(connection: socket.socket, message: dict[str, Any]) -> None:
+    data = json.dumps(message, separators=(",", ":")).encode()
+    connection.sendall(len(data).to_bytes(HEADER_SIZE, "big") + data)
+
+
+def _receive_exactly(connection: socket.socket, size: int) -> bytes:
+    data = bytearray()
+    while len(data) < size:
+        chunk = connection.recv(size - len(data))
+        if not chunk:
+            raise ConnectionError("The connection closed mid-message.")
+        data += chunk
+
+    return bytes(data)
+
+
+def receive(connection: socket.socket) -> dict[str, Any]:
+    size = int.from_bytes(_receive_exactly(connection, HEADER_SIZE), "big")
+    return json.loads(_receive_exactly(connection, size))
+
+
+def _table_key(table: PatternTable) -> str:
+    return words.digest(table.solutions, set(table.guesses) - set(table.solutions))
+
+
+class _WorkerHandler(socketserver.BaseRequestHandler):
+    server: "WorkerServer"
+
+    def handle(self) -> None:
+        table: PatternTable | None = None
+        while True:
+            try:
+                message = receive(self.request)
+            except (ConnectionError, OSError, ValueError):
+                return
+
+            if message["type"] == "words":
+                table = self.server.table(message)
+                send(self.request, {"ok": table is not None})
+            elif message["type"] == "rank" and table is not None:
+                time.sleep(self.server.delay)
+                send(self.request, _rank(table, message))
+            else:
+                send(self.request, {"error": f"Unexpected {message['type']!r}."})
+
+
+def _rank(table: PatternTable, message: dict[str, Any]) -> dict[str, Any]:
+    guess_ids = np.array(message["guess_ids"], dtype=np.intp)
+    patterns = table.matrix[guess_ids][:, np.array(message["solution_ids"])]
+
+    if message["bound"] is None:
+        scores = ranking.avg_remaining_solutions(patterns)
+        pruned = np.zeros(len(guess_ids), dtype=bool)
+    else:
+        bound = ranking.Bound(np.full(1, message["bound"]))
+        scores, pruned = ranking.avg_remaining_solutions_bounded(patterns, bound)
+
+    return {
+        "shard": message["shard"],
+        "scores": scores.tolist(),
+        "pruned": pruned.tolist(),
+    }
+
+
+class WorkerServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address: tuple[str, int], *, delay: float = 0.0) -> None:
+        super().__init__(address, _WorkerHandler)
+        self.delay = delay
+
+    def table(self, message: dict[str, Any]) -> PatternTable | None:
+        key = message["key"]
+        if key == words.digest(words.solutions, words.non_solutions):
+            return feedback.default_table()
+
+        if "solutions" in message:
+            return game.word_indexes(
+                set(message["solutions"]),
+                set(message["non_solutions"]),
+                persist=True,
+            ).pattern_table
+
+        # the coordinator only sends the lists when they are not known here
+        indexes = game._word_indexes.get(key)
+        return indexes.pattern_table if indexes is not None else None
+
+
+def serve_worker(
+    host: str = "127.0.0.1",
+    port: int = 8766,
+    *,
+    delay: float = 0.0,
+) -> None:
+    with WorkerServer((host, port), delay=delay) as server:
+        print(f"Ranking for coordinators on {host}:{port}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+class Node:
+    def __init__(self, address: str | tuple[str, int]) -> None:
+        if isinstance(address, str):
+            host, _, port = address.rpartition(":")
+            address = host, int(port)
+
+        self.address = address
+        self.busy = threading.Lock()
+        self._connection: socket.socket | None = None
+        self._key: str | None = None
+
+    def close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+
+        self._connection = None
+        self._key = None
+
+    def request(self, message: dict[str, Any], timeout: float) -> dict[str, Any]:
+        if self._connection is None:
+            self._connection = socket.create_connection(self.address, timeout)
+
+        self._connection.settimeout(timeout)
+        send(self._connection, message)
+        return receive(self._connection)
+
+    def prepare(self, table: PatternTable, key: str, timeout: float) -> None:
+        if self._key == key:
+            return
+
+        # word lists are only sent to nodes that have not seen them yet
+        if not self.request({"type": "words", "key": key}, timeout)["ok"]:
+            reply = self.request(
+                {
+                    "type": "words",
+                    "key": key,
+                    "solutions": list(table.solutions),
+                    "non_solutions": sorted(
+                        set(table.guesses) - set(table.solutions),
+                    ),
+                },
+                timeout,
+            )
+            if not reply["ok"]:
+                msg = f"{self.address} could not build the pattern table."
+                raise ConnectionError(msg)
+
+        self._key = key
+
+
+class DistributedExecutor:
+    def __init__(
+        self,
+        nodes: Iterable[str | tuple[str, int]],
+        *,
+        shard_size: int = 1024,
+        shard_timeout: float = 60.0,
+    ) -> None:
+        self.nodes = [Node(address) for address in nodes]
+        self.shard_size = shard_size
+        self.shard_timeout = shard_timeout
+
+    def close(self) -> None:
+        for node in self.nodes:
+            node.close()
+
+    def _free_nodes(self) -> list[Node]:
+        # a node still answering a previous, abandoned ranking sits this one
+        # out, unless every node is, in which case the first to finish is used
+        # (each of their requests ends within a shard timeout)
+        limit = time.perf_counter() + self.shard_timeout
+        while True:
+            free = [node for node in self.nodes if node.busy.acquire(blocking=False)]
+            if free or time.perf_counter() >= limit:
+                return free
+
+            time.sleep(0.01)
+
+    def avg_remaining_solutions(
+        self,
+        table: PatternTable,
+        solution_ids: np.ndarray,
+        guess_ids: np.ndarray | None = None,
+        *,
+        prune: bool = False,
+        deadline: float | None = None,
+    ) -> Ranked:
+        if guess_ids is None:
+            guess_ids = np.arange(len(table.guesses))
+
+        key = _table_key(table)
+        solution_id_list = solution_ids.tolist()
+
+        # each shard gets a future, resolved by whichever node answers first
+        shards: list[np.ndarray] = []
+        futures: list[Future] = []
+        condition = threading.Condition()
+        stop = threading.Event()
+        pending: deque[int] = deque()
+        running: dict[int, set[Node]] = {}
+        bound = [math.inf]
+
+        def submit(chunk: np.ndarray) -> Future:
+            future: Future = Future()
+            with condition:
+                shards.append(chunk)
+                futures.append(future)
+                pending.append(len(shards) - 1)
+                condition.notify_all()
+
+            return future
+
+        def next_shard(node: Node) -> int | None:
+            with condition:
+                while not stop.is_set():
+                    if pending:
+                        shard = pending.popleft()
+                    elif candidates := [
+                        shard for shard, nodes in running.items() if node not in nodes
+                    ]:
+                        # nothing is left to hand out, so help with the oldest
+                        # shard still running, in case it is stuck on a slow node
+                        shard = candidates[0]
+                    else:
+                        condition.wait()
+                        continue
+
+                    running.setdefault(shard, set()).add(node)
+                    return shard
+
+                return None
+
+        def drive(node: Node) -> None:
+            try:
+                node.prepare(table, key, self.shard_timeout)
+                while (shard := next_shard(node)) is not None:
+                    try:
+                        reply = node.request(
+                            {
+                                "type": "rank",
+                                "shard": shard,
+                                "guess_ids": shards[shard].tolist(),
+                                "solution_ids": solution_id_list,
+                                "bound": bound[0] if prune else None,
+                            },
+                            self.shard_timeout,
+                        )
+                        if "error" in reply:
+                            msg = f"{node.address} failed a shard: {reply['error']}"
+                            raise ConnectionError(msg)
+                    except BaseException:
+                        # the shard goes back to the queue, unless another
+                        # node is still working on it
+                        with condition:
+                            nodes = running.get(shard, set())
+                            nodes.discard(node)
+                            if not futures[shard].done() and not nodes:
+                                running.pop(shard, None)
+                                pending.appendleft(shard)
+                                condition.notify_all()
+                        raise
+
+                    with condition:
+                        running.pop(shard, None)
+                        if futures[shard].done():
+                            continue
+
+                        for score, was_pruned in zip(reply["scores"], reply["pruned"]):
+                            if not was_pruned and score < bound[0]:
+                                bound[0] = score
+                        futures[shard].set_result(reply)
+            except (OSError, ConnectionError, ValueError, KeyError):
+                node.close()
+            finally:
+                node.busy.release()
+                with condition:
+                    drivers.remove(node)
+                    if not drivers:
+                        # nobody is left to answer the shards still waiting
+                        for future in futures:
+                            if not future.done():
+                                msg = "Every worker node failed."
+                                future.set_exception(ConnectionError(msg))
+
+        def finish(
+            chunk: np.ndarray,
+            reply: dict[str, Any],
+        ) -> tuple[np.ndarray, np.ndarray]:
+            return np.array(reply["scores"]), np.array(reply["pruned"], dtype=bool)
+
+        drivers = self._free_nodes()
+        if not drivers:
+            msg = f"No worker node became free within {self.shard_timeout}s."
+            raise ConnectionError(msg)
+
+        for node in list(drivers):
+            threading.Thread(target=drive, args=(node,), daemon=True).start()
+
+        try:
+            # every shard is queued up front, and the nodes pull from the queue
+            yield from ranking.schedule(
+                table,
+                guess_ids,
+                submit,
+                in_flight=len(guess_ids),
+                batch_size=lambda: self.shard_size,
+                finish=finish,
+                deadline=deadline,
+            )
+        finally:
+            with condition:
+                stop.set()
+                condition.notify_all()
@@ -0,0 +1,186 @@
+import json
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+from wordle import pool, words
+from wordle.game import Game
+from wordle.instrumentation import percentiles
+
+# bumped whenever the record format changes, so old files are not resumed
+FORMAT = 1
+
+_template: Game | None = None
+
+
+def _initialize(options: dict[str, Any]) -> None:
+    global _template
+
+    # building the game (and its pattern table, for custom word lists) once
+    # per worker lets every game after the first start from a cheap copy
+    _template = Game(**options)
+    _template._patterns
+
+
+def play(solution: str) -> dict[str, Any]:
+    g = _template.with_solution(solution)
+    latencies = []
+    while not g.won and not g.lost:
+        started_at = time.perf_counter()
+        guess = g.best_guess
+        latencies.append(time.perf_counter() - started_at)
+        g.make_guess(guess)
+
+    return {
+        "solution": solution,
+        "guesses": [guess.word for guess in g.guesses],
+        "won": g.won,
+        "latencies": latencies,
+    }
+
+
+def header(options: dict[str, Any]) -> dict[str, Any]:
+    # word lists are recorded by their digest rather than in full
+    described = {
+        key: value
+        for key, value in options.items()
+        if key not in ("solutions", "non_solutions")
+    }
+    described["words"] = words.digest(
+        options.get("solutions", words.solutions),
+        options.get("non_solutions", words.non_solutions),
+    )
+    return {"format": FORMAT, "options": described}
+
+
+def read(path: Path) -> Iterator[dict[str, Any]]:
+    with path.open() as f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                # only the last line can be cut short, by an interrupted write
+                return
+
+
+def _resume(path: Path, expected: dict[str, Any]) -> set[str]:
+    completed = set()
+    good_bytes = 0
+    with path.open("rb") as f:
+        for number, line in enumerate(f):
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                break
+
+            if number == 0 and record != expected:
+                msg = f"{path} was written with different options: {record}"
+                raise ValueError(msg)
+
+            if "error" not in record and "solution" in record:
+                completed.add(record["solution"])
+            good_bytes += len(line)
+
+    # drop a partially written line so new records start on a line of their own
+    if good_bytes != path.stat().st_size:
+        with path.open("rb+") as f:
+            f.truncate(good_bytes)
+
+    return completed
+
+
+def evaluate(
+    answers: Iterable[str],
+    path: Path,
+    *,
+    processes: int | None = None,
+    in_flight: int | None = None,
+    **game_options: Any,
+) -> Path:
+    game_options["multiprocessing_disabled"] = True
+    expected = header(game_options)
+
+    completed = set()
+    if path.exists() and path.stat().st_size:
+        completed = _resume(path, expected)
+    else:
+        path.write_text(json.dumps(expected) + "\n")
+
+    # named apart from the solutions game option, which picks the word lists
+    remaining = [answer for answer in answers if answer not in completed]
+    processes = processes or pool.default_processes()
+    in_flight = in_flight or 2 * processes
+
+    total = len(remaining) + len(completed)
+    done_count = len(completed)
+
+    with (
+        path.open("a") as f,
+        ProcessPoolExecutor(
+            processes,
+            initializer=_initialize,
+            initargs=(game_options,),
+        ) as e,
+    ):
+        futures: dict[Future, str] = {}
+        position = 0
+        try:
+            while position < len(remaining) or futures:
+                while position < len(remaining) and len(futures) < in_flight:
+                    solution = remaining[position]
+                    futures[e.submit(play, solution)] = solution
+                    position += 1
+
+                finished, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    solution = futures.pop(future)
+                    try:
+                        record = future.result()
+                    except Exception as error:
+                        # recorded, and retried the next time the run resumes
+                        record = {"solution": solution, "error": repr(error)}
+
+                    f.write(json.dumps(record) + "\n")
+                    f.flush()
+
+                    done_count += 1
+                    print(f"\r{done_count} / {total} games", end="", file=sys.stderr)
+        finally:
+            for future in futures:
+                future.cancel()
+
+            os.fsync(f.fileno())
+            print(file=sys.stderr)
+
+    return path
+
+
+def summarize(path: Path) -> dict[str, Any]:
+    # later records replace earlier ones, so a retried game only counts once
+    options: dict[str, Any] = {}
+    records: dict[str, dict[str, Any]] = {}
+    for number, record in enumerate(read(path)):
+        if number == 0:
+            options = record.get("options", {})
+        else:
+            records[record["solution"]] = record
+
+    games = [r for r in records.values() if "error" not in r]
+    won = [r for r in games if r["won"]]
+    distribution = Counter(len(r["guesses"]) for r in won)
+
+    return {
+        "options": options,
+        "games": len(games),
+        "errors": len(records) - len(games),
+        "success_rate": len(won) / max(len(games), 1),
+        "average_guesses": sum(len(r["guesses"]) for r in won) / max(len(won), 1),
+        "distribution": {str(k): distribution[k] for k in sorted(distribution)},
+        "turn_latency": percentiles(
+            [latency for r in games for latency in r["latencies"]],
+        ),
+    }
@@ -0,0 +1,201 @@
+import atexit
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Generator, Protocol
+
+import numpy as np
+
+from wordle import instrumentation, pool, ranking
+from wordle.feedback import PatternTable
+
+AUTO = "auto"
+SERIAL = "serial"
+THREAD = "thread"
+PROCESS = "process"
+PERSISTENT = "persistent"
+BACKENDS = (AUTO, SERIAL, THREAD, PROCESS, PERSISTENT)
+
+# threads share the matrix and the bound without any copying, so they pay
+# off for smaller problems than processes do
+MINIMUM_THREADED_CELLS = 1_000_000
+
+Ranked = Generator[tuple[str, float, bool], None, None]
+
+
+class Executor(Protocol):
+    def avg_remaining_solutions(
+        self,
+        table: PatternTable,
+        solution_ids: np.ndarray,
+        guess_ids: np.ndarray | None = None,
+        *,
+        prune: bool = False,
+        deadline: float | None = None,
+    ) -> Ranked: ...
+
+
+class SerialExecutor:
+    def avg_remaining_solutions(
+        self,
+        table: PatternTable,
+        solution_ids: np.ndarray,
+        guess_ids: np.ndarray | None = None,
+        *,
+        prune: bool = False,
+        deadline: float | None = None,
+    ) -> Ranked:
+        return ranking.iter_avg_remaining_solutions(
+            table,
+            solution_ids,
+            guess_ids,
+            bound=ranking.Bound() if prune else None,
+            deadline=deadline,
+        )
+
+
+class ThreadExecutor:
+    def __init__(self, threads: int | None = None, *, batch_size: int = 512) -> None:
+        self.threads = threads or pool.default_processes()
+        self.batch_size = batch_size
+        self._executor = ThreadPoolExecutor(self.threads)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(cancel_futures=True)
+
+    def avg_remaining_solutions(
+        self,
+        table: PatternTable,
+        solution_ids: np.ndarray,
+        guess_ids: np.ndarray | None = None,
+        *,
+        prune: bool = False,
+        deadline: float | None = None,
+    ) -> Ranked:
+        if guess_ids is None:
+            guess_ids = np.arange(len(table.guesses))
+
+        # a lost race in Bound.offer only leaves a looser bound, never a wrong one
+        bound = ranking.Bound() if prune else None
+
+        def rank_chunk(chunk: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+            patterns = table.matrix[chunk][:, solution_ids]
+            if bound is None:
+                return (
+                    ranking.avg_remaining_solutions(patterns),
+                    np.zeros(len(chunk), dtype=bool),
+                )
+
+            return ranking.avg_remaining_solutions_bounded(patterns, bound)
+
+        stats = instrumentation.active()
+
+        def finish(
+            chunk: np.ndarray,
+            result: tuple[np.ndarray, np.ndarray],
+        ) -> tuple[np.ndarray, np.ndarray]:
+            scores, pruned = result
+            if stats is not None:
+                stats.count("guesses scored", len(scores))
+                stats.count("guesses pruned", int(pruned.sum()))
+
+            return scores, pruned
+
+        return ranking.schedule(
+            table,
+            guess_ids,
+            lambda chunk: self._executor.submit(rank_chunk, chunk),
+            in_flight=2 * self.threads,
+            batch_size=lambda: self.batch_size,
+            finish=finish,
+            deadline=deadline,
+        )
+
+
+class ProcessExecutor:
+    # a pool that only lives for one ranking, mostly useful for comparison
+    def __init__(self, processes: int | None = None) -> None:
+        self.processes = processes
+
+    def avg_remaining_solutions(
+        self,
+        table: PatternTable,
+        solution_ids: np.ndarray,
+        guess_ids: np.ndarray | None = None,
+        *,
+        prune: bool = False,
+        deadline: float | None = None,
+    ) -> Ranked:
+        solver_pool = pool.SolverPool(self.processes)
+        try:
+            yield from solver_pool.avg_remaining_solutions(
+                table,
+                solution_ids,
+                guess_ids,
+                prune=prune,
+                deadline=deadline,
+            )
+        finally:
+            # tasks still running past a deadline are abandoned, not awaited
+            solver_pool.shutdown(wait=False)
+
+
+_serial = SerialExecutor()
+_threads: ThreadExecutor | None = None
+
+
+def shared_threads() -> ThreadExecutor:
+    global _threads
+
+    if _threads is None:
+        _threads = ThreadExecutor()
+        atexit.register(_threads.shutdown)
+
+    return _threads
+
+
+def free_threaded() -> bool:
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return is_gil_enabled is not None and not is_gil_enabled()
+
+
+def automatic_backend(cells: int, processes: int | None = None) -> str:
+    processes = processes or pool.default_processes()
+    if processes <= 1:
+        return SERIAL
+
+    if free_threaded():
+        return THREAD if cells >= MINIMUM_THREADED_CELLS else SERIAL
+
+    return PERSISTENT if cells >= pool.MINIMUM_POOLED_CELLS else SERIAL
+
+
+def choose(
+    cells: int,
+    backend: str | Executor = AUTO,
+    *,
+    solver_pool: pool.SolverPool | None = None,
+) -> Executor:
+    # an executor configured elsewhere, such as a set of remote worker nodes
+    if not isinstance(backend, str):
+        return backend
+
+    if backend == AUTO:
+        backend = automatic_backend(
+            cells,
+            solver_pool.processes if solver_pool is not None else None,
+        )
+
+    if (stats := instrumentation.active()) is not None:
+        stats.count(f"{backend} rankings")
+
+    if backend == SERIAL:
+        return _serial
+    if backend == THREAD:
+        return shared_threads()
+    if backend == PROCESS:
+        return ProcessExecutor()
+    if backend == PERSISTENT:
+        return solver_pool or pool.shared()
+
+    msg = f"{backend!r} is not an execution backend, expected one of {BACKENDS}."
+    raise ValueError(msg)
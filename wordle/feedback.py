@@ -0,0 +1,200 @@
+import os
+from collections import Counter
+from functools import cache, cached_property
+from pathlib import Path
+from typing import Sequence
+
+import numpy as np
+
+from wordle import words
+from wordle.cache import cache_directory
+
+GRAY, YELLOW, GREEN = 0, 1, 2
+PATTERN_COUNT = 3**5
+SOLVED = PATTERN_COUNT - 1
+
+
+def pattern(guess: str, solution: str) -> int:
+    colors = [GRAY] * 5
+    unmatched = Counter()
+    for i, (g, s) in enumerate(zip(guess, solution)):
+        if g == s:
+            colors[i] = GREEN
+        else:
+            unmatched[s] += 1
+
+    for i, g in enumerate(guess):
+        if colors[i] != GREEN and unmatched[g] > 0:
+            colors[i] = YELLOW
+            unmatched[g] -= 1
+
+    return encode(colors)
+
+
+def encode(colors: Sequence[int]) -> int:
+    return sum(color * 3**i for i, color in enumerate(colors))
+
+
+def decode(code: int) -> tuple[int, ...]:
+    return tuple(code // 3**i % 3 for i in range(5))
+
+
+COLOR_SYMBOLS = {
+    "G": GREEN,
+    "Y": YELLOW,
+    "B": GRAY,
+    "X": GRAY,
+    "-": GRAY,
+    ".": GRAY,
+    # as shared from the game, including its high contrast colors
+    "🟩": GREEN,
+    "🟧": GREEN,
+    "🟨": YELLOW,
+    "🟦": YELLOW,
+    "⬛": GRAY,
+    "⬜": GRAY,
+}
+
+
+def parse(text: str) -> int:
+    # emoji squares are sometimes followed by an invisible variation selector
+    symbols = text.strip().replace("\ufe0f", "").upper()
+    if len(symbols) != 5 or any(s not in COLOR_SYMBOLS for s in symbols):
+        msg = f"{text!r} is not a feedback pattern (5 of {''.join(COLOR_SYMBOLS)})."
+        raise ValueError(msg)
+
+    return encode([COLOR_SYMBOLS[s] for s in symbols])
+
+
+def letter_array(word_list: Sequence[str]) -> np.ndarray:
+    return np.frombuffer(
+        "".join(word_list).encode("ascii"),
+        dtype=np.uint8,
+    ).reshape(-1, 5)
+
+
+def build_matrix(
+    guesses: Sequence[str],
+    solutions: Sequence[str],
+    *,
+    chunk_size: int = 256,
+) -> np.ndarray:
+    solution_letters = letter_array(solutions)[None, :, :]
+    guess_letters = letter_array(guesses)
+    matrix = np.empty((len(guesses), len(solutions)), dtype=np.uint8)
+
+    for start in range(0, len(guesses), chunk_size):
+        chunk = guess_letters[start : start + chunk_size]
+        greens = chunk[:, None, :] == solution_letters
+        codes = np.zeros(greens.shape[:2], dtype=np.uint8)
+
+        for i in range(5):
+            letter = chunk[:, None, i, None]
+
+            # a letter is yellow if the solution has more unmatched copies of
+            # it than the guess has already used on unmatched earlier slots
+            available = ((solution_letters == letter) & ~greens).sum(axis=2)
+            used = (
+                (chunk[:, None, :i] == letter) & ~greens[:, :, :i]
+            ).sum(axis=2)
+            yellows = ~greens[:, :, i] & (used < available)
+
+            codes += np.where(greens[:, :, i], GREEN, yellows).astype(np.uint8) * (
+                3**i
+            )
+
+        matrix[start : start + len(chunk)] = codes
+
+    return matrix
+
+
+class PatternTable:
+    def __init__(
+        self,
+        guesses: Sequence[str],
+        solutions: Sequence[str],
+        matrix: np.ndarray,
+        path: Path | None = None,
+    ) -> None:
+        if matrix.shape != (len(guesses), len(solutions)):
+            msg = f"Pattern matrix has shape {matrix.shape}, expected {(len(guesses), len(solutions))}."
+            raise ValueError(msg)
+
+        self.guesses = tuple(guesses)
+        self.solutions = tuple(solutions)
+        self.matrix = matrix
+        self.path = path
+
+        self.guess_ids = {word: i for i, word in enumerate(self.guesses)}
+        self.solution_ids = {word: i for i, word in enumerate(self.solutions)}
+
+    @classmethod
+    def build(
+        cls,
+        guesses: Sequence[str],
+        solutions: Sequence[str],
+    ) -> "PatternTable":
+        return cls(guesses, solutions, build_matrix(guesses, solutions))
+
+    @classmethod
+    def load(
+        cls,
+        path: Path,
+        guesses: Sequence[str],
+        solutions: Sequence[str],
+    ) -> "PatternTable":
+        return cls(guesses, solutions, np.load(path, mmap_mode="r"), path)
+
+    def save(self, path: Path) -> None:
+        partial_path = path.with_name(f"{path.name}.{os.getpid()}.partial")
+        with partial_path.open("wb") as f:
+            np.save(f, np.ascontiguousarray(self.matrix))
+
+        os.replace(partial_path, path)
+        self.path = path
+
+    @cached_property
+    def guess_letters(self) -> np.ndarray:
+        return letter_array(self.guesses)
+
+    @cached_property
+    def solution_letters(self) -> np.ndarray:
+        return letter_array(self.solutions)
+
+    def pattern(self, guess: str, solution: str) -> int:
+        return int(self.matrix[self.guess_ids[guess], self.solution_ids[solution]])
+
+
+def table_path(key: str) -> Path:
+    return cache_directory() / f"pattern-matrix-{key}.npy"
+
+
+def default_path() -> Path:
+    return table_path(words.digest(words.solutions, words.non_solutions))
+
+
+def build_default() -> Path:
+    path = default_path()
+    PatternTable.build(words.all_words_list, words.solutions_list).save(path)
+    return path
+
+
+@cache
+def default_table() -> PatternTable:
+    table = None
+    try:
+        path = default_path()
+        if not path.exists():
+            table = PatternTable.build(words.all_words_list, words.solutions_list)
+            table.save(path)
+    except OSError:
+        # without a writable cache directory the table only lives in memory
+        if table is None:
+            table = PatternTable.build(words.all_words_list, words.solutions_list)
+        return table
+
+    return PatternTable.load(path, words.all_words_list, words.solutions_list)
+
+
+if __name__ == "__main__":
+    print(f"Wrote {build_default()}")
@@ -1,27 +1,30 @@
-import json
 import os
+import pickle
 import random
 import re
 import string
 import time
-from collections import Counter, defaultdict
-from concurrent.futures import ProcessPoolExecutor, as_completed
-from dataclasses import dataclass
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from functools import cached_property, lru_cache
 from itertools import chain, islice
 from pathlib import Path
-from typing import ClassVar, Generator, Iterable
+from typing import Any, ClassVar, Generator, Iterable
 
 import colorama as clr
+import numpy as np
 
-from wordle import words
-
-clr.init()
-
-try:
-    with open(Path(__file__).parent / "initial-guess-rankings.json") as f:
-        initial_guess_rankings = json.load(f)
-except Exception:
-    initial_guess_rankings = None
+from wordle import (
+    cache,
+    decisions,
+    executors,
+    feedback,
+    instrumentation,
+    openings,
+    pool,
+    ranking,
+    words,
+)
 
 
 def green(x: str) -> str:
@@ -101,32 +104,53 @@ class WordBank:
 
 @dataclass(frozen=True)
 class Guess:
-    _word: str
-    _exact_letter_counts: dict[str, int]
-    _minimum_letter_counts: dict[str, int]
-    _positives: set[tuple[str, int]]
-    _negatives: set[tuple[str, int]]
+    word: str
+    pattern: int
 
-    @property
-    def word(self) -> str:
-        return self._word
-
-    def __str__(self) -> str:
-        letters = [""] * 5
+    @cached_property
+    def colors(self) -> tuple[int, ...]:
+        return feedback.decode(self.pattern)
 
-        indications = self._exact_letter_counts | self._minimum_letter_counts
-        for letter, index in self._positives:
-            letters[index] = green(letter)
-            indications[letter] -= 1
+    @cached_property
+    def _constraints(
+        self,
+    ) -> tuple[
+        dict[str, int],
+        dict[str, int],
+        set[tuple[str, int]],
+        set[tuple[str, int]],
+    ]:
+        exact_letter_counts = {}
+        minimum_letter_counts = {}
+        for letter in set(self.word):
+            slots = [self.colors[i] for i, let in enumerate(self.word) if let == letter]
+            indicated = sum(color != feedback.GRAY for color in slots)
+            if feedback.GRAY in slots:
+                exact_letter_counts[letter] = indicated
+            else:
+                minimum_letter_counts[letter] = indicated
 
-        for letter, index in self._negatives:
-            if indications.get(letter, 0) > 0:
-                letters[index] = yellow(letter)
-                indications[letter] -= 1
+        positives = set()
+        negatives = set()
+        for i, letter in enumerate(self.word):
+            if self.colors[i] == feedback.GREEN:
+                positives.add((letter, i))
             else:
-                letters[index] = gray(letter)
+                negatives.add((letter, i))
+
+        return exact_letter_counts, minimum_letter_counts, positives, negatives
+
+    def __str__(self) -> str:
+        paint = {feedback.GREEN: green, feedback.YELLOW: yellow, feedback.GRAY: gray}
+        return "".join(
+            paint[color](letter) for letter, color in zip(self.word, self.colors)
+        )
+
 
-        return "".join(letters)
+@lru_cache(maxsize=1 << 16)
+def _guess(word: str, pattern: int) -> Guess:
+    # guesses are shared between games, so each one is only decoded once
+    return Guess(word, pattern)
 
 
 @dataclass
@@ -135,6 +159,8 @@ class GuessRanking:
     solution_ranks: dict[str, float]
     non_solution_ranks: dict[str, float]
     solution: str | None = None
+    pruned_ranks: dict[str, float] = field(default_factory=dict)
+    stats: dict[str, dict] | None = None
 
     def __str__(self) -> str:
         if self.solution:
@@ -192,43 +218,215 @@ class GuessRanking:
         if summary_parts:
             parts.append(", ".join(summary_parts))
 
+        if self.pruned_ranks:
+            parts.append(gray(f"<{len(self.pruned_ranks):,} pruned>"))
+
         return " ".join(parts)
 
 
+class _LazyDefault:
+    # the default filter is only loaded (or built) once something uses it
+    def __init__(self) -> None:
+        self.value: WordFilter | None = None
+
+    def __get__(self, instance: object, owner: type["WordFilter"]) -> "WordFilter":
+        if self.value is None:
+            self.value = owner.load_default()
+
+        return self.value
+
+
 class WordFilter:
-    DEFAULT: ClassVar["WordFilter"]
+    DEFAULT: ClassVar["WordFilter"] = _LazyDefault()
     WORD_RE: ClassVar = re.compile(r"[A-Z]{5}")
+    CACHE_VERSION: ClassVar = 1
 
     def __init__(self, words: set[str]) -> None:
-        self.frozen_words = frozenset(words)
         self.words = words
 
-        self.words_with_letter_at_index: defaultdict[tuple[str, int], set[str]] = (
-            defaultdict(set)
-        )
-        for word in words:
-            for index, letter in enumerate(word):
-                self.words_with_letter_at_index[letter, index].add(word)
-
-        self.words_containing_minimum_letter_count: defaultdict[
-            tuple[str, int],
-            set[str],
-        ] = defaultdict(set)
-
-        self.words_containing_exact_letter_count: defaultdict[
-            tuple[str, int],
-            set[str],
-        ] = defaultdict(set)
-
-        for word in words:
-            for letter, count in Counter(word).items():
-                self.words_containing_exact_letter_count[letter, count].add(word)
-
-                for minimum in range(1, count + 1):
-                    self.words_containing_minimum_letter_count[letter, minimum].add(
-                        word,
+        # every word gets a dense id, and each posting is a bitset of ids
+        self.universe = tuple(sorted(words))
+        self._universe_array = np.array(self.universe, dtype="<U5")
+        self._bitset_size = (len(self.universe) + 7) // 8
+        self.everything = (1 << len(self.universe)) - 1
+
+        self.words_with_letter_at_index: dict[tuple[str, int], int] = {}
+        self.words_containing_minimum_letter_count: dict[tuple[str, int], int] = {}
+        self.words_containing_exact_letter_count: dict[tuple[str, int], int] = {}
+
+        letters = feedback.letter_array(self.universe)
+        for code in np.unique(letters).tolist():
+            letter = chr(code)
+            matches = letters == code
+
+            for index in range(5):
+                if matches[:, index].any():
+                    self.words_with_letter_at_index[letter, index] = self._bitset(
+                        matches[:, index],
                     )
 
+            counts = matches.sum(axis=1)
+            for count in range(1, int(counts.max()) + 1):
+                self.words_containing_exact_letter_count[letter, count] = (
+                    self._bitset(counts == count)
+                )
+                self.words_containing_minimum_letter_count[letter, count] = (
+                    self._bitset(counts >= count)
+                )
+
+    @classmethod
+    def load(cls, path: Path) -> "WordFilter":
+        with path.open("rb") as f:
+            version, universe, everything, *postings = pickle.load(f)
+
+        if version != cls.CACHE_VERSION:
+            msg = f"{path} holds a version {version} word filter."
+            raise ValueError(msg)
+
+        word_filter = object.__new__(cls)
+        word_filter.universe = universe
+        word_filter._universe_array = np.array(universe, dtype="<U5")
+        word_filter._bitset_size = (len(universe) + 7) // 8
+        word_filter.everything = everything
+        (
+            word_filter.words_with_letter_at_index,
+            word_filter.words_containing_minimum_letter_count,
+            word_filter.words_containing_exact_letter_count,
+        ) = postings
+
+        return word_filter
+
+    @classmethod
+    def cache_path(cls, key: str) -> Path:
+        name = f"word-filter-v{cls.CACHE_VERSION}-{key}.pickle"
+        return cache.cache_directory() / name
+
+    @classmethod
+    def cached(cls, guessable: set[str], key: str) -> "WordFilter":
+        try:
+            path = cls.cache_path(key)
+        except OSError:
+            # without a usable cache directory the filter only lives in memory
+            return cls(guessable)
+
+        try:
+            return cls.load(path)
+        except Exception:
+            pass
+
+        word_filter = cls(guessable)
+        try:
+            word_filter.save(path)
+        except OSError:
+            pass
+
+        return word_filter
+
+    @classmethod
+    def load_default(cls) -> "WordFilter":
+        return cls.cached(
+            words.all_words,
+            words.digest(words.solutions, words.non_solutions),
+        )
+
+    def save(self, path: Path) -> None:
+        partial_path = path.with_name(f"{path.name}.{os.getpid()}.partial")
+        with partial_path.open("wb") as f:
+            pickle.dump(
+                (
+                    self.CACHE_VERSION,
+                    self.universe,
+                    self.everything,
+                    self.words_with_letter_at_index,
+                    self.words_containing_minimum_letter_count,
+                    self.words_containing_exact_letter_count,
+                ),
+                f,
+                protocol=pickle.HIGHEST_PROTOCOL,
+            )
+
+        os.replace(partial_path, path)
+
+    @staticmethod
+    def _bitset(members: np.ndarray) -> int:
+        return int.from_bytes(
+            np.packbits(members, bitorder="little").tobytes(),
+            "little",
+        )
+
+    def _words(self, bitset: int) -> set[str]:
+        members = np.unpackbits(
+            np.frombuffer(bitset.to_bytes(self._bitset_size, "little"), np.uint8),
+            count=len(self.universe),
+            bitorder="little",
+        )
+        return set(self._universe_array[members.astype(bool)].tolist())
+
+    def _restricted(self, bitset: int) -> "WordFilter":
+        child = object.__new__(WordFilter)
+
+        # the universe and the postings are shared with the root filter, and
+        # every filter starts from its own bitset, so they never need copying
+        child.universe = self.universe
+        child._universe_array = self._universe_array
+        child._bitset_size = self._bitset_size
+        child.everything = bitset
+        child.words_with_letter_at_index = self.words_with_letter_at_index
+        child.words_containing_minimum_letter_count = (
+            self.words_containing_minimum_letter_count
+        )
+        child.words_containing_exact_letter_count = (
+            self.words_containing_exact_letter_count
+        )
+
+        return child
+
+    @cached_property
+    def words(self) -> set[str]:
+        return self._words(self.everything)
+
+    @cached_property
+    def frozen_words(self) -> frozenset[str]:
+        return frozenset(self.words)
+
+    @cached_property
+    def word_ids(self) -> dict[str, int]:
+        return {word: i for i, word in enumerate(self.universe)}
+
+    def _filter_bitset(
+        self,
+        exact_letter_counts: dict[str, int] | None = None,
+        minimum_letter_counts: dict[str, int] | None = None,
+        positives: Iterable[tuple[str, int]] = (),
+        negatives: Iterable[tuple[str, int]] = (),
+    ) -> int:
+        bitset = self.everything
+        for letter, count in (exact_letter_counts or {}).items():
+            if count > 0:
+                bitset &= self.words_containing_exact_letter_count.get(
+                    (letter, count),
+                    0,
+                )
+            else:
+                bitset &= ~self.words_containing_minimum_letter_count.get(
+                    (letter, 1),
+                    0,
+                )
+
+        for letter, count in (minimum_letter_counts or {}).items():
+            bitset &= self.words_containing_minimum_letter_count.get(
+                (letter, count),
+                0,
+            )
+
+        for positive in positives:
+            bitset &= self.words_with_letter_at_index.get(positive, 0)
+
+        for negative in negatives:
+            bitset &= ~self.words_with_letter_at_index.get(negative, 0)
+
+        return bitset
+
     def _filter(
         self,
         exact_letter_counts: dict[str, int] | None = None,
@@ -244,42 +442,121 @@ class WordFilter:
         ):
             return self.words
 
-        return set.intersection(
-            *(
-                (
-                    self.words_containing_exact_letter_count[letter, count]
-                    if count > 0
-                    else (
-                        self.words
-                        - self.words_containing_minimum_letter_count[letter, 1]
-                    )
-                )
-                for letter, count in (exact_letter_counts or {}).items()
-            ),
-            *(
-                self.words_containing_minimum_letter_count[letter, count]
-                for letter, count in (minimum_letter_counts or {}).items()
-            ),
-            *(self.words_with_letter_at_index[positive] for positive in positives),
-            *(
-                (self.words - self.words_with_letter_at_index[negative])
-                for negative in negatives
+        return self._words(
+            self._filter_bitset(
+                exact_letter_counts,
+                minimum_letter_counts,
+                positives,
+                negatives,
             ),
         )
 
     def filter(self, guess: Guess) -> set[str]:
-        return self._filter(
-            guess._exact_letter_counts,
-            guess._minimum_letter_counts,
-            guess._positives,
-            guess._negatives,
-        )
+        if (stats := instrumentation.active()) is not None:
+            stats.count("filter calls")
+
+        return self._filter(*guess._constraints)
 
     def narrow(self, guess: Guess) -> "WordFilter":
-        return WordFilter(self.filter(guess))
+        if (stats := instrumentation.active()) is not None:
+            stats.count("filter calls")
+
+        return self._restricted(self._filter_bitset(*guess._constraints))
+
+
+class WordIndexes:
+    # everything derived from one pair of custom word lists, shared by every
+    # game that uses them
+    def __init__(
+        self,
+        solutions: set[str],
+        non_solutions: set[str],
+        *,
+        key: str,
+        persist: bool = False,
+    ) -> None:
+        if solutions & non_solutions:
+            msg = f"Words cannot be both solutions and non-solutions. These words do not comply: {solutions & non_solutions!r}"
+            raise ValueError(msg)
+
+        for word in chain(solutions, non_solutions):
+            if not WordFilter.WORD_RE.match(word):
+                msg = f"A provided word, {word!r}, is invalid (must match /{WordFilter.WORD_RE.pattern}/)."
+                raise ValueError(msg)
+
+        self.key = key
+        self.persist = persist
+        self.solutions = solutions
+        self.non_solutions = non_solutions
+        self.guessable = solutions | non_solutions
+        self.word_filter = (
+            WordFilter.cached(self.guessable, key)
+            if persist
+            else WordFilter(self.guessable)
+        )
+
+    @cached_property
+    def pattern_table(self) -> feedback.PatternTable:
+        guesses = sorted(self.guessable)
+        solutions = sorted(self.solutions)
 
+        if self.persist:
+            try:
+                return feedback.PatternTable.load(
+                    feedback.table_path(self.key),
+                    guesses,
+                    solutions,
+                )
+            except (OSError, ValueError):
+                pass
+
+        table = feedback.PatternTable.build(guesses, solutions)
+        if self.persist:
+            try:
+                table.save(feedback.table_path(self.key))
+            except OSError:
+                pass
+
+        return table
+
+    def save(self) -> None:
+        # lists first used without persisting are saved once a caller asks,
+        # and a table built later on is saved as it is built
+        self.persist = True
+        try:
+            self.word_filter.save(WordFilter.cache_path(self.key))
+            if "pattern_table" in self.__dict__:
+                self.pattern_table.save(feedback.table_path(self.key))
+        except OSError:
+            pass
+
+
+# experiments tend to play many games in a row on the same custom lists
+WORD_INDEX_CACHE_SIZE = 8
+_word_indexes: OrderedDict[str, WordIndexes] = OrderedDict()
+
+
+def word_indexes(
+    solutions: set[str],
+    non_solutions: set[str],
+    *,
+    persist: bool = False,
+) -> WordIndexes:
+    key = words.digest(solutions, non_solutions)
 
-WordFilter.DEFAULT = WordFilter(words.all_words)
+    indexes = _word_indexes.get(key)
+    if indexes is None:
+        indexes = WordIndexes(solutions, non_solutions, key=key, persist=persist)
+        _word_indexes[key] = indexes
+
+        while len(_word_indexes) > WORD_INDEX_CACHE_SIZE:
+            _word_indexes.popitem(last=False)
+    else:
+        _word_indexes.move_to_end(key)
+        if persist and not indexes.persist:
+            indexes.save()
+
+    return indexes
 
 
 class Game:
@@ -291,34 +568,43 @@ class Game:
         solutions: Iterable[str] | None = None,
         non_solutions: Iterable[str] | None = None,
         multiprocessing_disabled: bool = False,
+        use_decision_tree: bool = False,
+        solver_pool: pool.SolverPool | None = None,
+        pruning: bool = False,
+        ranking_cache: cache.RankingCache | None = None,
+        executor: str | executors.Executor = executors.AUTO,
+        hard_mode: bool = False,
+        persist_indexes: bool = False,
     ) -> None:
+        if isinstance(executor, str) and executor not in executors.BACKENDS:
+            msg = f"{executor!r} is not an execution backend, expected one of {executors.BACKENDS}."
+            raise ValueError(msg)
+
         if solutions is None and non_solutions is None:
             self._solutions = words.solutions
             self._non_solutions = words.non_solutions
             self._guessable = words.all_words
             self._word_filter = WordFilter.DEFAULT
+            self._indexes = None
         else:
-            self._solutions = (
-                {s.strip().upper() for s in solutions}
-                if solutions is not None
-                else words.solutions
-            )
-            self._non_solutions = (
-                {s.strip().upper() for s in non_solutions}
-                if non_solutions is not None
-                else words.non_solutions
+            # lists that were used before (by content) reuse their indexes
+            self._indexes = word_indexes(
+                (
+                    {s.strip().upper() for s in solutions}
+                    if solutions is not None
+                    else words.solutions
+                ),
+                (
+                    {s.strip().upper() for s in non_solutions}
+                    if non_solutions is not None
+                    else words.non_solutions
+                ),
+                persist=persist_indexes,
             )
-            self._guessable = self._solutions | self._non_solutions
-            self._word_filter = WordFilter(self._guessable)
-
-            if self._solutions & self._non_solutions:
-                msg = f"Words cannot be both solutions and non-solutions. These words do not comply: {self._solutions & self._non_solutions!r}"
-                raise ValueError(msg)
-
-            for word in chain(self._solutions, self._non_solutions):
-                if not WordFilter.WORD_RE.match(word):
-                    msg = f"A provided word, {word!r}, is invalid (must match /{WordFilter.WORD_RE.pattern}/)."
-                    raise ValueError(msg)
+            self._solutions = self._indexes.solutions
+            self._non_solutions = self._indexes.non_solutions
+            self._guessable = self._indexes.guessable
+            self._word_filter = self._indexes.word_filter
 
         self._solution = (
             solution if solution is not None else random.choice(tuple(self._solutions))
@@ -330,18 +616,38 @@ class Game:
 
         self.enforce_guess_validity = enforce_guess_validity
         self.multiprocessing_disabled = multiprocessing_disabled
-
-        self._solution_letter_counts = Counter(self._solution)
-        self._guesses: list[Guess] = []
-        self._guess_set: set[str] = set()
+        self.use_decision_tree = use_decision_tree
+        self._solver_pool = solver_pool
+        self.pruning = pruning
+        self.ranking_cache = ranking_cache
+        self.executor = executors.SERIAL if multiprocessing_disabled else executor
+        self.hard_mode = hard_mode
+
+        # guesses are stored as (word id, pattern) pairs, with ids indexing
+        # the vocabulary, and the rich Guess objects are built on demand
+        self._vocabulary = self._word_filter.universe
+        self._word_ids = self._word_filter.word_ids
+        self._history: tuple[tuple[int, int], ...] = ()
+        self._pattern_table: feedback.PatternTable | None = None
 
     @property
     def guesses(self) -> tuple[Guess, ...]:
-        return tuple(self._guesses)
+        return tuple(
+            _guess(self._vocabulary[word_id], pattern)
+            for word_id, pattern in self._history
+        )
+
+    @property
+    def history(self) -> tuple[tuple[str, int], ...]:
+        return tuple(
+            (self._vocabulary[word_id], pattern) for word_id, pattern in self._history
+        )
 
     @property
     def won(self) -> bool:
-        return self._solution in self._guess_set
+        return any(
+            self._vocabulary[word_id] == self._solution for word_id, _ in self._history
+        )
 
     @property
     def lost(self) -> bool:
@@ -349,74 +655,102 @@ class Game:
 
     @property
     def score(self) -> int:
-        return len(self._guesses)
+        return len(self._history)
 
     def _evaluate_guess(self, word: str, *, solution: str | None = None) -> Guess:
         if len(word) != 5:
             raise InvalidGuess("Not a 5-letter word.")
 
-        word_letter_counts = Counter(word)
-
         if self.enforce_guess_validity and word not in self._guessable:
             err = f"{word!r} is not a real word."
             raise InvalidGuess(err)
 
-        if solution is not None:
-            solution_letter_counts = Counter(solution)
-        else:
+        if solution is None:
             solution = self._solution
-            solution_letter_counts = self._solution_letter_counts
-
-        exact_letter_counts = {}
-        minimum_letter_counts = {}
-        for letter, guessed_count in word_letter_counts.items():
-            solution_count = solution_letter_counts[letter]
-            if guessed_count > solution_count:
-                exact_letter_counts[letter] = solution_count
-            else:
-                minimum_letter_counts[letter] = guessed_count
 
-        positives = set()
-        negatives = set()
-        for i, letter in enumerate(word):
-            if letter == solution[i]:
-                positives.add((letter, i))
-            else:
-                negatives.add((letter, i))
+        if (stats := instrumentation.active()) is not None:
+            stats.count("guesses evaluated")
+
+        return _guess(word, feedback.pattern(word, solution))
+
+    @classmethod
+    def from_history(
+        cls,
+        history: Iterable[tuple[str, int]],
+        **options: Any,
+    ) -> "Game":
+        game = cls(**options)
+        for word, pattern in history:
+            word = word.strip().upper()
+            if game.enforce_guess_validity and word not in game._guessable:
+                err = f"{word!r} is not a real word."
+                raise InvalidGuess(err)
+
+            game._perform_guess(word, pattern)
+
+        # the solution is unknown, so stand in any one that fits the history
+        if not game.possible_solutions:
+            msg = "No solution is consistent with this history."
+            raise ValueError(msg)
 
-        return Guess(
-            word,
-            exact_letter_counts,
-            minimum_letter_counts,
-            positives,
-            negatives,
-        )
+        game._solution = min(game.possible_solutions)
+        return game
 
-    def _perform_guess(self, guess: Guess) -> None:
-        self._guesses.append(guess)
-        self._guess_set.add(guess.word)
+    def _word_id(self, word: str) -> int:
+        word_id = self._word_ids.get(word)
+        if word_id is None:
+            # only reachable when guess validity is not enforced, the
+            # vocabulary may be shared so it is extended on a copy
+            word_id = len(self._vocabulary)
+            self._vocabulary = (*self._vocabulary, word)
+            self._word_ids = self._word_ids | {word: word_id}
+
+        return word_id
+
+    def _check_hard_mode(self, word: str) -> None:
+        # every revealed hint has to be used: greens stay in place, and
+        # yellows (and greens) must appear at least as often as revealed
+        for guess in self.guesses:
+            exact_letter_counts, minimum_letter_counts, positives, _ = (
+                guess._constraints
+            )
+            for letter, index in sorted(positives, key=lambda p: p[1]):
+                if word[index] != letter:
+                    ordinal = ("1st", "2nd", "3rd", "4th", "5th")[index]
+                    err = f"{ordinal} letter must be {letter}."
+                    raise InvalidGuess(err)
+
+            for letter, count in (exact_letter_counts | minimum_letter_counts).items():
+                if word.count(letter) < count:
+                    err = f"Guess must contain {letter}."
+                    raise InvalidGuess(err)
+
+    def _perform_guess(self, word: str, pattern: int) -> Guess:
+        if self.hard_mode:
+            self._check_hard_mode(word)
+
+        guess = _guess(word, pattern)
+        self._history = (*self._history, (self._word_id(word), pattern))
         self._word_filter = self._word_filter.narrow(guess)
+        return guess
 
     def make_guess(self, word: str) -> Guess:
         guess = self._evaluate_guess(word)
-        self._perform_guess(guess)
-        return guess
+        return self._perform_guess(guess.word, guess.pattern)
 
     @property
     def letter_bank(self) -> LetterBank:
-        greens = {letter for g in self._guesses for letter, _ in g._positives}
+        guesses = self.guesses
+        greens = {letter for g in guesses for letter, _ in g._constraints[2]}
         grays = {
             letter
-            for g in self._guesses
-            for letter, count in g._exact_letter_counts.items()
+            for g in guesses
+            for letter, count in g._constraints[0].items()
             if count == 0
         }
         not_yellow = greens | grays
         yellows = {
-            letter
-            for word in self._guess_set
-            for letter in word
-            if letter not in not_yellow
+            letter for g in guesses for letter in g.word if letter not in not_yellow
         }
 
         return LetterBank(greens, yellows, grays)
@@ -447,75 +781,131 @@ class Game:
         game._solutions = self._solutions
         game._non_solutions = self._non_solutions
         game._guessable = self._guessable
+        game._indexes = self._indexes
 
         # these are immutable
         game.enforce_guess_validity = self.enforce_guess_validity
         game.multiprocessing_disabled = self.multiprocessing_disabled
+        game.use_decision_tree = self.use_decision_tree
+        game._solver_pool = self._solver_pool
+        game.pruning = self.pruning
+        game.ranking_cache = self.ranking_cache
+        game.executor = self.executor
+        game.hard_mode = self.hard_mode
         game._word_filter = self._word_filter
+        game._pattern_table = self._pattern_table
 
-        # container of immutable data
-        game._guesses = self._guesses.copy()
-        game._guess_set = self._guess_set.copy()
+        game._vocabulary = self._vocabulary
+        game._word_ids = self._word_ids
+        game._history = self._history
 
         # update solution
         game._solution = solution
-        game._solution_letter_counts = Counter(solution)
         if solution not in game._solutions:
             msg = f"{solution!r} is not a solution."
             raise ValueError(msg)
 
         return game
 
-    def _mp_avg_solution_by_guess(
+    @property
+    def _patterns(self) -> feedback.PatternTable:
+        if self._pattern_table is None:
+            if self._guessable is words.all_words:
+                self._pattern_table = feedback.default_table()
+            else:
+                self._pattern_table = self._indexes.pattern_table
+
+        return self._pattern_table
+
+    def _book(self, *, partial: bool = False) -> dict[str, float] | None:
+        # the books assume any word may be guessed
+        if self._guessable is not words.all_words or (self.hard_mode and self._history):
+            return None
+
+        if not self._history:
+            return openings.initial_rankings()
+
+        # the second turn book only keeps the best few guesses, which is
+        # enough to pick one but not to stand in for a full ranking
+        if partial and len(self._history) == 1:
+            return openings.second_rankings(*self.history[0])
+
+        return None
+
+    def _ranked_guesses(
         self,
-        test_guesses: Iterable[str],
-    ) -> dict[str, float]:
-        solution_filter = WordFilter(self.possible_solutions)
-
-        data = {}
-        for guess in test_guesses:
-            total_remaining_solutions = 0
-
-            for solution in solution_filter.words:
-                total_remaining_solutions += len(
-                    solution_filter.filter(
-                        self._evaluate_guess(guess, solution=solution),
-                    ),
-                )
+        prune: bool = False,
+        deadline: float | None = None,
+    ) -> Generator[tuple[str, float, bool], None, None]:
+        if (book := self._book()) is not None:
+            for guess, score in book.items():
+                yield guess, score, False
+            return
+
+        table = self._patterns
+        solution_ids = np.fromiter(
+            (table.solution_ids[s] for s in self.possible_solutions),
+            dtype=np.intp,
+        )
+
+        # in hard mode only words consistent with every hint may be guessed
+        guess_ids = None
+        if self.hard_mode:
+            # sorted, since set order (and so the order of ties) varies by hash seed
+            guess_ids = np.sort(
+                np.fromiter(
+                    (table.guess_ids[g] for g in self._possible_guesses),
+                    dtype=np.intp,
+                ),
+            )
 
-            data[guess] = total_remaining_solutions / len(solution_filter.words)
+        # promising guesses go first, so a deadline cuts off the weak ones
+        # and pruning finds a tight bound early
+        guess_ids = ranking.heuristic_order(table, solution_ids, guess_ids)
 
-        return data
+        executor = executors.choose(
+            len(guess_ids) * len(solution_ids),
+            self.executor,
+            solver_pool=self._solver_pool,
+        )
+        yield from executor.avg_remaining_solutions(
+            table,
+            solution_ids,
+            guess_ids,
+            prune=prune,
+            deadline=deadline,
+        )
 
     @property
     def avg_remaining_solutions_by_guess(
         self,
     ) -> Generator[tuple[str, float], None, None]:
-        if (
-            self._guessable is words.all_words
-            and not self._guesses
-            and initial_guess_rankings is not None
-        ):
-            yield from initial_guess_rankings.items()
-            return
+        for guess, score, _ in self._ranked_guesses():
+            yield guess, score
 
-        if self.multiprocessing_disabled:
-            yield from self._mp_avg_solution_by_guess(self._guessable).items()
+    def get_guess_rankings(
+        self,
+        timeout: float | None = None,
+        *,
+        prune: bool | None = None,
+    ) -> GuessRanking:
+        stats = instrumentation.active()
+        if stats is None:
+            return self._get_guess_rankings(timeout, prune)
+
+        stats.count("rankings")
+        stats.gauge("candidate solutions", len(self.possible_solutions))
+        with stats.timer("ranking"):
+            ranking = self._get_guess_rankings(timeout, prune)
+
+        ranking.stats = stats.as_dict()
+        return ranking
 
-        processes = (os.cpu_count() or 4) - 1
-        with ProcessPoolExecutor(processes) as e:
-            try:
-                args = list(self._guessable)
-                futures = [
-                    e.submit(self._mp_avg_solution_by_guess, args[i :: processes * 4])
-                    for i in range(processes * 4)
-                ]
-                for future in as_completed(futures):
-                    yield from future.result().items()
-            finally:
-                e.shutdown(wait=False, cancel_futures=True)
-
-    def get_guess_rankings(self, timeout: float | None = None) -> GuessRanking:
+    def _get_guess_rankings(
+        self,
+        timeout: float | None,
+        prune: bool | None,
+    ) -> GuessRanking:
         started_at = time.perf_counter()
         ranking = GuessRanking(False, {}, {})
 
@@ -524,28 +914,82 @@ class Game:
             ranking.solution = next(iter(possible_solutions))
             return ranking
 
-        for guess, avg_remaining_solutions in self.avg_remaining_solutions_by_guess:
-            if guess in possible_solutions:
+        prune = self.pruning if prune is None else prune
+
+        cache_key = None
+        if self.ranking_cache is not None:
+            cache_key = self._ranking_cache_key(prune)
+            cached = self.ranking_cache.get(cache_key)
+
+            if (stats := instrumentation.active()) is not None:
+                stats.count(
+                    "ranking cache misses" if cached is None else "ranking cache hits",
+                )
+
+            if cached is not None:
+                return GuessRanking(**cached)
+
+        deadline = None if timeout is None else started_at + timeout
+        for guess, avg_remaining_solutions, pruned in self._ranked_guesses(
+            prune,
+            deadline,
+        ):
+            if pruned:
+                ranking.pruned_ranks[guess] = avg_remaining_solutions
+            elif guess in possible_solutions:
                 ranking.solution_ranks[guess] = avg_remaining_solutions
             else:
                 ranking.non_solution_ranks[guess] = avg_remaining_solutions
 
-            if timeout is not None and (time.perf_counter() - started_at) > timeout:
-                ranking.timed_out = True
-                break
+        # the engines stop between batches (without a word) once the deadline
+        # passes, and always finish the batch they are on
+        if deadline is not None and time.perf_counter() >= deadline:
+            ranking.timed_out = True
+
+        # a partial ranking would be served as if it were complete
+        if cache_key is not None and not ranking.timed_out:
+            self.ranking_cache.put(cache_key, asdict(ranking))
 
         return ranking
 
+    def _ranking_cache_key(self, prune: bool) -> str:
+        history = ",".join(f"{word}{pattern}" for word, pattern in self.history)
+        lists = words.digest(self._solutions, self._non_solutions)
+        mode = f"{'pruned' if prune else 'full'}{'-hard' if self.hard_mode else ''}"
+        return f"{lists}/{mode}/{history}"
+
     @property
     def best_guess(self) -> str:
-        ranking = self.get_guess_rankings()
-        if ranking.solution:
-            return ranking.solution
+        if (
+            self.use_decision_tree
+            and self._guessable is words.all_words
+            and not self.hard_mode
+        ):
+            guess = decisions.lookup(self.history)
+            if guess is not None:
+                return guess
 
-        ranks = ranking.solution_ranks | ranking.non_solution_ranks
-        best_solution = min(ranks, key=ranks.__getitem__)
+        possible_solutions = self.possible_solutions
+        if len(possible_solutions) <= 2:
+            # nothing leaves fewer candidates than guessing one of them
+            return min(possible_solutions)
+
+        ranks = self._book(partial=True)
+        if ranks is None:
+            ranking = self.get_guess_rankings()
+            if ranking.solution:
+                return ranking.solution
+
+            ranks = ranking.solution_ranks | ranking.non_solution_ranks
+
+        # engines yield in heuristic or completion order, so ties are broken
+        # explicitly: a possible solution first, then alphabetically
+        best_solution = min(
+            ranks,
+            key=lambda guess: (ranks[guess], guess not in possible_solutions, guess),
+        )
         solutions_remaining = ranks[best_solution]
-        solutions_removed = len(self.possible_solutions) - solutions_remaining
+        solutions_removed = len(possible_solutions) - solutions_remaining
 
         if solutions_removed <= 1:
             # if the optimal guess at best removes one solution,
@@ -553,12 +997,12 @@ class Game:
             # would also remove a solution)
             # We never want to remove just one solution by guessing
             # a non-solution.
-            return next(iter(self.possible_solutions))
+            return min(possible_solutions)
 
         return best_solution
 
     def __str__(self) -> str:
-        rows = [str(g) for g in self._guesses]
+        rows = [str(g) for g in self.guesses]
         if self.lost:
             rows.append(red(self._solution))
 
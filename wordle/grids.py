@@ -0,0 +1,129 @@
+import os
+from functools import cache
+from pathlib import Path
+from typing import Iterable, Sequence
+
+import numpy as np
+
+from wordle import feedback, words
+from wordle.cache import cache_directory
+from wordle.feedback import PATTERN_COUNT, PatternTable
+
+
+def _is_row(line: str) -> bool:
+    # anything with a colored square, or made only of color symbols, is meant
+    # as a row, while headers like "Wordle 1,234 4/6" are not
+    symbols = line.strip().replace("\ufe0f", "").upper()
+    return bool(symbols) and (
+        any(not s.isascii() and s in feedback.COLOR_SYMBOLS for s in symbols)
+        or all(s in feedback.COLOR_SYMBOLS for s in symbols)
+    )
+
+
+def parse_grid(text: str) -> list[int]:
+    # a malformed row raises rather than being skipped, since dropping it
+    # would quietly allow more answers
+    rows = [feedback.parse(line) for line in text.splitlines() if _is_row(line)]
+
+    if not rows:
+        msg = f"{text!r} has no rows of feedback."
+        raise ValueError(msg)
+
+    return rows
+
+
+class PatternIndex:
+    def __init__(self, solutions: Sequence[str], counts: np.ndarray) -> None:
+        if counts.shape != (PATTERN_COUNT, len(solutions)):
+            msg = f"Pattern index has shape {counts.shape}, expected {(PATTERN_COUNT, len(solutions))}."
+            raise ValueError(msg)
+
+        self.solutions = tuple(solutions)
+        # how many guesses give each pattern against each solution
+        self.counts = counts
+
+    @classmethod
+    def build(cls, table: PatternTable, *, chunk_size: int = 1024) -> "PatternIndex":
+        n = len(table.solutions)
+        columns = np.arange(n)
+        counts = np.zeros(PATTERN_COUNT * n, dtype=np.int64)
+
+        # one bincount per chunk of guesses, over (pattern, solution) cells
+        for start in range(0, len(table.guesses), chunk_size):
+            cells = table.matrix[start : start + chunk_size].astype(np.intp) * n
+            counts += np.bincount(
+                (cells + columns).ravel(),
+                minlength=PATTERN_COUNT * n,
+            )
+
+        return cls(table.solutions, counts.reshape(PATTERN_COUNT, n).astype(np.uint16))
+
+    @classmethod
+    def load(cls, path: Path, solutions: Sequence[str]) -> "PatternIndex":
+        return cls(solutions, np.load(path, mmap_mode="r"))
+
+    def save(self, path: Path) -> None:
+        partial_path = path.with_name(f"{path.name}.{os.getpid()}.partial")
+        with partial_path.open("wb") as f:
+            np.save(f, np.ascontiguousarray(self.counts))
+
+        os.replace(partial_path, path)
+
+    def candidates(self, patterns: Iterable[int]) -> dict[str, float]:
+        rows = np.unique(np.fromiter(patterns, dtype=np.intp))
+        counts = self.counts[rows]
+        consistent = np.flatnonzero((counts > 0).all(axis=0))
+
+        # a solution is more plausible the more guesses could have given
+        # each row, so candidates come back most plausible first
+        weights = np.log(counts[:, consistent].astype(np.float64)).sum(axis=0)
+        order = np.lexsort((consistent, -weights))
+        return {
+            self.solutions[consistent[i]]: float(weights[i])
+            for i in order.tolist()
+        }
+
+
+def index_path(key: str) -> Path:
+    return cache_directory() / f"pattern-index-{key}.npy"
+
+
+@cache
+def default_index() -> PatternIndex:
+    try:
+        return PatternIndex.load(
+            index_path(words.digest(words.solutions, words.non_solutions)),
+            words.solutions_list,
+        )
+    except (OSError, ValueError):
+        pass
+
+    index = PatternIndex.build(feedback.default_table())
+    try:
+        index.save(index_path(words.digest(words.solutions, words.non_solutions)))
+    except OSError:
+        pass
+
+    return index
+
+
+def solutions(
+    grids: Iterable[str | Sequence[int]],
+    *,
+    index: PatternIndex | None = None,
+) -> list[str]:
+    # every grid is for the same answer, so their rows simply add up
+    patterns = []
+    for grid in grids:
+        if isinstance(grid, str):
+            patterns.extend(parse_grid(grid))
+            continue
+
+        for code in grid:
+            if not isinstance(code, int) or not 0 <= code < PATTERN_COUNT:
+                msg = f"{code!r} is not a feedback pattern."
+                raise ValueError(msg)
+
+            patterns.append(code)
+
+    return list((index or default_index()).candidates(patterns))
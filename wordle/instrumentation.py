@@ -0,0 +1,134 @@
+import cProfile
+import pstats
+import sys
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+# None unless something is recording, so the hot paths only pay for a lookup
+_active: ContextVar["Stats | None"] = ContextVar("stats", default=None)
+
+
+class Stats:
+    def __init__(self) -> None:
+        self.counters: defaultdict[str, int] = defaultdict(int)
+        self.gauges: dict[str, float] = {}
+        self.timers: defaultdict[str, float] = defaultdict(float)
+        self.workers: defaultdict[str, list[float]] = defaultdict(lambda: [0, 0.0])
+
+    def count(self, name: str, amount: int = 1) -> None:
+        self.counters[name] += amount
+
+    def gauge(self, name: str, value: float) -> None:
+        self.gauges[name] = value
+
+    def add_time(self, name: str, seconds: float) -> None:
+        self.timers[name] += seconds
+
+    @contextmanager
+    def timer(self, name: str) -> Iterator[None]:
+        started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timers[name] += time.perf_counter() - started_at
+
+    def worker(self, worker: str, guesses: int, seconds: float) -> None:
+        totals = self.workers[worker]
+        totals[0] += guesses
+        totals[1] += seconds
+
+    def as_dict(self) -> dict[str, dict]:
+        return {
+            "counters": dict(self.counters),
+            "gauges": dict(self.gauges),
+            "timers": dict(self.timers),
+            "workers": {
+                worker: {
+                    "guesses": guesses,
+                    "seconds": seconds,
+                    "guesses_per_second": guesses / seconds if seconds else 0.0,
+                }
+                for worker, (guesses, seconds) in self.workers.items()
+            },
+        }
+
+    def update(self, data: dict[str, dict]) -> None:
+        for name, amount in data.get("counters", {}).items():
+            self.count(name, amount)
+        for name, value in data.get("gauges", {}).items():
+            self.gauge(name, value)
+        for name, seconds in data.get("timers", {}).items():
+            self.add_time(name, seconds)
+        for worker, totals in data.get("workers", {}).items():
+            self.worker(worker, totals["guesses"], totals["seconds"])
+
+    def __str__(self) -> str:
+        return format_stats(self.as_dict())
+
+
+def format_stats(data: dict[str, dict]) -> str:
+    lines = []
+    for name, amount in sorted(data.get("counters", {}).items()):
+        lines.append(f"{name}: {amount:,}")
+    for name, value in sorted(data.get("gauges", {}).items()):
+        lines.append(f"{name}: {value:,}")
+    for name, seconds in sorted(data.get("timers", {}).items()):
+        lines.append(f"{name}: {seconds * 1000:,.1f}ms")
+    for worker, totals in sorted(data.get("workers", {}).items()):
+        lines.append(
+            f"worker {worker}: {totals['guesses']:,} guesses"
+            f" in {totals['seconds'] * 1000:,.1f}ms"
+            f" ({totals['guesses_per_second']:,.0f}/s)",
+        )
+
+    return "\n".join(lines)
+
+
+def percentiles(samples: list[float]) -> dict[str, float]:
+    ordered = sorted(samples)
+    if not ordered:
+        return {}
+
+    def at(fraction: float) -> float:
+        return ordered[min(int(fraction * len(ordered)), len(ordered) - 1)]
+
+    return {
+        "count": len(ordered),
+        "mean": sum(ordered) / len(ordered),
+        "p50": at(0.50),
+        "p95": at(0.95),
+        "p99": at(0.99),
+    }
+
+
+def active() -> Stats | None:
+    return _active.get()
+
+
+@contextmanager
+def recording(stats: Stats | None = None) -> Iterator[Stats]:
+    stats = Stats() if stats is None else stats
+    token = _active.set(stats)
+    try:
+        yield stats
+    finally:
+        _active.reset(token)
+
+
+@contextmanager
+def profiling(path: str | None = None, *, limit: int = 20) -> Iterator[None]:
+    profile = cProfile.Profile()
+    profile.enable()
+    try:
+        yield
+    finally:
+        profile.disable()
+        if path:
+            profile.dump_stats(path)
+        else:
+            pstats.Stats(profile, stream=sys.stderr).sort_stats(
+                "cumulative",
+            ).print_stats(limit)
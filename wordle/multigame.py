@@ -0,0 +1,158 @@
+import random
+import time
+from typing import Any, Sequence
+
+import numpy as np
+
+from wordle import feedback, ranking
+from wordle.game import Game, Guess, GuessRanking, InvalidGuess
+
+
+class MultiGame:
+    def __init__(
+        self,
+        solutions: Sequence[str] | None = None,
+        *,
+        boards: int = 4,
+        max_guesses: int | None = None,
+        **game_options: Any,
+    ) -> None:
+        if solutions is not None:
+            solutions = [s.strip().upper() for s in solutions]
+            if len(set(solutions)) != len(solutions):
+                msg = f"Every board needs a different solution, got {solutions!r}."
+                raise ValueError(msg)
+
+        first = Game(solutions[0] if solutions else None, **game_options)
+        if not solutions:
+            solutions = random.sample(sorted(first._solutions), boards)
+            first = first.with_solution(solutions[0])
+
+        # build the pattern table before copying the game, so that every
+        # board shares it along with the word filter and the vocabulary
+        first._patterns
+
+        self.boards = [first] + [first.with_solution(s) for s in solutions[1:]]
+        self.max_guesses = (
+            max_guesses if max_guesses is not None else len(self.boards) + 5
+        )
+        self._history: list[str] = []
+
+    @property
+    def guesses(self) -> tuple[str, ...]:
+        return tuple(self._history)
+
+    @property
+    def won(self) -> bool:
+        return all(board.won for board in self.boards)
+
+    @property
+    def lost(self) -> bool:
+        return self.score >= self.max_guesses and not self.won
+
+    @property
+    def score(self) -> int:
+        return len(self._history)
+
+    @property
+    def unsolved(self) -> list[Game]:
+        return [board for board in self.boards if not board.won]
+
+    @property
+    def possible_solutions(self) -> set[str]:
+        return set().union(*(board.possible_solutions for board in self.unsolved))
+
+    def make_guess(self, word: str) -> tuple[Guess | None, ...]:
+        unsolved = self.unsolved
+        if not unsolved:
+            raise InvalidGuess("Every board is already solved.")
+
+        # validate once, boards that are already solved take no more guesses
+        unsolved[0]._evaluate_guess(word)
+
+        table = self.boards[0]._patterns
+        guesses = []
+        for board in self.boards:
+            if board.won:
+                guesses.append(None)
+                continue
+
+            if word in table.guess_ids:
+                pattern = table.pattern(word, board._solution)
+            else:
+                pattern = feedback.pattern(word, board._solution)
+
+            guesses.append(board._perform_guess(word, pattern))
+
+        self._history.append(word)
+        return tuple(guesses)
+
+    def get_guess_rankings(
+        self,
+        timeout: float | None = None,
+        *,
+        chunk_size: int = 1024,
+    ) -> GuessRanking:
+        unsolved = self.unsolved
+        if len(unsolved) == 1:
+            return unsolved[0].get_guess_rankings(timeout)
+
+        started_at = time.perf_counter()
+        rankings = GuessRanking(False, {}, {})
+
+        # every board's candidates sit side by side in one set of columns,
+        # so each guess row is only gathered once for all of the boards
+        table = self.boards[0]._patterns
+        candidates = [
+            np.fromiter(
+                (table.solution_ids[s] for s in board.possible_solutions),
+                dtype=np.intp,
+            )
+            for board in unsolved
+        ]
+        solution_ids = np.concatenate(candidates)
+        sizes = [len(ids) for ids in candidates]
+
+        possible_solutions = self.possible_solutions
+        guess_ids = ranking.heuristic_order(table, np.unique(solution_ids))
+        for start in range(0, len(guess_ids), chunk_size):
+            chunk = guess_ids[start : start + chunk_size]
+            scores = ranking.combined_avg_remaining_solutions(
+                table.matrix[chunk][:, solution_ids],
+                sizes,
+            )
+            for guess_id, score in zip(chunk.tolist(), scores.tolist()):
+                guess = table.guesses[guess_id]
+                if guess in possible_solutions:
+                    rankings.solution_ranks[guess] = score
+                else:
+                    rankings.non_solution_ranks[guess] = score
+
+            if timeout is not None and (time.perf_counter() - started_at) > timeout:
+                rankings.timed_out = True
+                break
+
+        return rankings
+
+    @property
+    def best_guess(self) -> str:
+        # every board starts out the same, so the best opener is the best
+        # single board opener, and a lone board is just a normal game
+        unsolved = self.unsolved
+        if not self._history or len(unsolved) == 1:
+            return unsolved[0].best_guess
+
+        # on ties, a word that might solve a board is the better guess
+        rankings = self.get_guess_rankings()
+        ranks = rankings.non_solution_ranks | rankings.solution_ranks
+        return min(
+            ranks,
+            key=lambda guess: (ranks[guess], guess not in rankings.solution_ranks),
+        )
+
+    def __str__(self) -> str:
+        # boards can outlast a single game's six guesses, so they are drawn
+        # from their guesses rather than with Game.__str__
+        return "\n\n".join(
+            "\n".join(str(guess) for guess in board.guesses) for board in self.boards
+        )
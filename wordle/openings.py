@@ -0,0 +1,82 @@
+import json
+from functools import cache
+from pathlib import Path
+
+import numpy as np
+
+from wordle import feedback, ranking, words
+
+directory = Path(__file__).parent
+initial_path = directory / "initial-guess-rankings.json"
+second_path = directory / "second-guess-rankings.json"
+
+
+def _default_key() -> str:
+    return words.digest(words.solutions, words.non_solutions)
+
+
+def _load(path: Path) -> dict | None:
+    try:
+        with path.open() as f:
+            data = json.load(f)
+    except Exception:
+        return None
+
+    if not isinstance(data, dict) or data.get("key") != _default_key():
+        return None
+
+    return data
+
+
+def _rank(
+    table: feedback.PatternTable,
+    solution_ids: np.ndarray,
+    depth: int | None = None,
+) -> dict[str, float]:
+    scores = ranking.iter_avg_remaining_solutions(table, solution_ids)
+    ordered = sorted(
+        ((guess, round(score, 4)) for guess, score, _ in scores),
+        key=lambda item: item[1],
+    )
+    return dict(ordered[:depth])
+
+
+@cache
+def initial_rankings() -> dict[str, float] | None:
+    data = _load(initial_path)
+    return data["rankings"] if data is not None else None
+
+
+@cache
+def _second_rankings() -> dict[str, dict[str, dict[str, float]]]:
+    data = _load(second_path)
+    return data["openers"] if data is not None else {}
+
+
+def second_rankings(opener: str, pattern: int) -> dict[str, float] | None:
+    return _second_rankings().get(opener, {}).get(str(pattern))
+
+
+def generate(openers: int = 5, depth: int = 25) -> None:
+    table = feedback.default_table()
+    key = _default_key()
+
+    all_solutions = np.arange(len(table.solutions))
+    initial = _rank(table, all_solutions)
+    with initial_path.open("w") as f:
+        json.dump({"key": key, "rankings": initial}, f, indent=4)
+
+    second: dict[str, dict[str, dict[str, float]]] = {}
+    for opener in list(initial)[:openers]:
+        patterns = np.asarray(table.matrix[table.guess_ids[opener]])
+        second[opener] = {}
+        for pattern in np.unique(patterns).tolist():
+            solution_ids = np.flatnonzero(patterns == pattern)
+            if len(solution_ids) > 1:
+                second[opener][str(pattern)] = _rank(table, solution_ids, depth)
+
+    with second_path.open("w") as f:
+        json.dump({"key": key, "depth": depth, "openers": second}, f)
+
+    initial_rankings.cache_clear()
+    _second_rankings.cache_clear()
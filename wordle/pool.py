@@ -0,0 +1,259 @@
+import atexit
+import os
+import pickle
+import time
+import weakref
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+from multiprocessing import resource_tracker, shared_memory
+from typing import Generator, Iterable
+
+import numpy as np
+
+from wordle import instrumentation, ranking
+from wordle.feedback import PatternTable
+
+# below this many (guess, solution) cells, ranking in-process beats
+# handing the work to another process
+MINIMUM_POOLED_CELLS = 5_000_000
+
+# guesses are handed out in batches sized to keep each task around this
+# long, so results (and the deadline) are checked regularly
+TASK_SECONDS = 0.05
+MINIMUM_BATCH = 64
+MAXIMUM_BATCH = 4096
+
+# a matrix is either a file on disk or a shared memory segment, and workers
+# only ever see it through one of these: (kind, name, shape)
+Handle = tuple[str, str, tuple[int, int]]
+
+# workers keep the matrices they used most recently, and let go of the rest
+# (a segment whose table is gone in the parent is never asked for again)
+WORKER_MATRICES = 4
+
+_matrices: OrderedDict[Handle, np.ndarray] = OrderedDict()
+_segments: dict[Handle, shared_memory.SharedMemory] = {}
+
+
+def _matrix(handle: Handle) -> np.ndarray:
+    if handle in _matrices:
+        _matrices.move_to_end(handle)
+        return _matrices[handle]
+
+    kind, name, shape = handle
+    if kind == "file":
+        _matrices[handle] = np.load(name, mmap_mode="r")
+    else:
+        segment = shared_memory.SharedMemory(name)
+        _segments[handle] = segment
+        _matrices[handle] = np.ndarray(shape, dtype=np.uint8, buffer=segment.buf)
+
+    while len(_matrices) > WORKER_MATRICES:
+        # the view has to go before its segment can be closed
+        evicted, _ = _matrices.popitem(last=False)
+        if (segment := _segments.pop(evicted, None)) is not None:
+            segment.close()
+
+    return _matrices[handle]
+
+
+def _initialize(handles: tuple[Handle, ...]) -> None:
+    for handle in handles:
+        _matrix(handle)
+
+
+def _avg_remaining_solutions(
+    handle: Handle,
+    guess_ids: np.ndarray,
+    solution_ids: np.ndarray,
+    bound_name: str | None = None,
+) -> tuple[np.ndarray, np.ndarray, str, float]:
+    # the worker and its compute time come back for throughput stats
+    started_at = time.perf_counter()
+    patterns = _matrix(handle)[guess_ids][:, solution_ids]
+    if bound_name is None:
+        scores = ranking.avg_remaining_solutions(patterns)
+        pruned = np.zeros(len(guess_ids), dtype=bool)
+    else:
+        segment = shared_memory.SharedMemory(bound_name)
+        try:
+            bound = ranking.Bound(np.ndarray(1, dtype=np.float64, buffer=segment.buf))
+            scores, pruned = ranking.avg_remaining_solutions_bounded(patterns, bound)
+            del bound
+        finally:
+            segment.close()
+
+    return scores, pruned, str(os.getpid()), time.perf_counter() - started_at
+
+
+def default_processes() -> int:
+    return max((os.cpu_count() or 2) - 1, 1)
+
+
+class SolverPool:
+    def __init__(
+        self,
+        processes: int | None = None,
+        *,
+        preload: Iterable[PatternTable] = (),
+    ) -> None:
+        self.processes = processes or default_processes()
+        self._started = False
+        self._shared: dict[
+            int,
+            tuple[shared_memory.SharedMemory, weakref.finalize],
+        ] = {}
+
+        # workers attach to segments created here, and must report them to
+        # this process's resource tracker, or each would start its own and
+        # warn at exit about segments that were already unlinked
+        if os.name == "posix":
+            resource_tracker.ensure_running()
+
+        self._executor = ProcessPoolExecutor(
+            self.processes,
+            initializer=_initialize,
+            initargs=(tuple(self._handle(table) for table in preload),),
+        )
+
+    def __enter__(self) -> "SolverPool":
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.shutdown()
+
+    def shutdown(self, *, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+        for key in list(self._shared):
+            self._release(key)
+
+    def _handle(self, table: PatternTable) -> Handle:
+        shape = table.matrix.shape
+        if table.path is not None:
+            return "file", str(table.path), shape
+
+        if id(table) not in self._shared:
+            segment = shared_memory.SharedMemory(
+                create=True,
+                size=max(table.matrix.nbytes, 1),
+            )
+            np.ndarray(shape, dtype=np.uint8, buffer=segment.buf)[:] = table.matrix
+
+            # the segment lives as long as its table (such as custom word
+            # lists evicted from game.word_indexes), and no longer
+            self._shared[id(table)] = (
+                segment,
+                weakref.finalize(table, self._release, id(table)),
+            )
+
+        return "shm", self._shared[id(table)][0].name, shape
+
+    def _release(self, key: int) -> None:
+        shared = self._shared.pop(key, None)
+        if shared is None:
+            return
+
+        segment, finalizer = shared
+        finalizer.detach()
+        segment.close()
+        segment.unlink()
+
+    def avg_remaining_solutions(
+        self,
+        table: PatternTable,
+        solution_ids: np.ndarray,
+        guess_ids: np.ndarray | None = None,
+        *,
+        prune: bool = False,
+        deadline: float | None = None,
+    ) -> Generator[tuple[str, float, bool], None, None]:
+        if guess_ids is None:
+            guess_ids = np.arange(len(table.guesses))
+
+        bound_segment = None
+        if prune:
+            bound_segment = shared_memory.SharedMemory(create=True, size=8)
+            np.ndarray(1, dtype=np.float64, buffer=bound_segment.buf)[0] = np.inf
+
+        handle = self._handle(table)
+        solution_ids = solution_ids.astype(np.int32)
+        guess_ids = guess_ids.astype(np.int32)
+        stats = instrumentation.active()
+
+        batch = MINIMUM_BATCH
+
+        def submit(chunk: np.ndarray) -> Future:
+            task = (
+                handle,
+                chunk,
+                solution_ids,
+                bound_segment.name if bound_segment is not None else None,
+            )
+
+            submitted_at = time.perf_counter()
+            future = self._executor.submit(_avg_remaining_solutions, *task)
+            if stats is not None:
+                # workers are only spawned by the first submission
+                stats.add_time(
+                    "pool submit" if self._started else "pool startup",
+                    time.perf_counter() - submitted_at,
+                )
+                stats.count("pool tasks")
+                stats.count("pool task bytes", len(pickle.dumps(task)))
+            self._started = True
+
+            return future
+
+        def finish(
+            chunk: np.ndarray,
+            result: tuple[np.ndarray, np.ndarray, str, float],
+        ) -> tuple[np.ndarray, np.ndarray]:
+            nonlocal batch
+
+            scores, pruned, worker, seconds = result
+            if stats is not None:
+                stats.count("pool result bytes", scores.nbytes + pruned.nbytes)
+                stats.count("guesses scored", len(scores))
+                stats.count("guesses pruned", int(pruned.sum()))
+                stats.worker(worker, len(scores), seconds)
+
+            if seconds > 0:
+                batch = int(
+                    np.clip(
+                        TASK_SECONDS * len(chunk) / seconds,
+                        MINIMUM_BATCH,
+                        MAXIMUM_BATCH,
+                    ),
+                )
+
+            return scores, pruned
+
+        try:
+            yield from ranking.schedule(
+                table,
+                guess_ids,
+                submit,
+                in_flight=2 * self.processes,
+                batch_size=lambda: batch,
+                finish=finish,
+                deadline=deadline,
+                wait_timer="pool wait",
+            )
+        finally:
+            if bound_segment is not None:
+                bound_segment.close()
+                bound_segment.unlink()
+
+
+_shared: SolverPool | None = None
+
+
+def shared() -> SolverPool:
+    global _shared
+
+    if _shared is None:
+        _shared = SolverPool()
+        atexit.register(_shared.shutdown)
+
+    return _shared
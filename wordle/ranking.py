@@ -0,0 +1,265 @@
+import math
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from typing import Any, Callable, Generator
+
+import numpy as np
+
+from wordle import instrumentation
+from wordle.feedback import PATTERN_COUNT, PatternTable
+
+# with a deadline, guesses are scored in batches sized to take about this
+# long, so that the clock is checked often without much overhead
+BATCH_SECONDS = 0.02
+MINIMUM_BATCH = 16
+
+# below this many solutions the partial counts rarely rule out enough
+# guesses to pay for themselves (measured break even is around 250-300)
+MINIMUM_PRUNED_SOLUTIONS = 256
+
+
+class Bound:
+    # the best score found so far, stored in an array so that workers can
+    # share one through a shared memory buffer
+    def __init__(self, array: np.ndarray | None = None) -> None:
+        if array is None:
+            array = np.full(1, math.inf)
+
+        self.array = array
+
+    @property
+    def value(self) -> float:
+        return float(self.array[0])
+
+    def offer(self, score: float) -> None:
+        if score < self.array[0]:
+            self.array[0] = score
+
+
+def bucket_sizes(patterns: np.ndarray) -> np.ndarray:
+    rows = patterns.shape[0]
+    offsets = patterns.astype(np.intp) + (
+        np.arange(rows, dtype=np.intp)[:, None] * PATTERN_COUNT
+    )
+    return np.bincount(
+        offsets.ravel(),
+        minlength=rows * PATTERN_COUNT,
+    ).reshape(rows, PATTERN_COUNT)
+
+
+def avg_remaining_solutions(patterns: np.ndarray) -> np.ndarray:
+    # a solution in a bucket of size k leaves k candidates, so the
+    # bucket contributes k * k to the total over all solutions
+    counts = bucket_sizes(patterns)
+    return (counts * counts).sum(axis=1) / patterns.shape[1]
+
+
+def combined_avg_remaining_solutions(
+    patterns: np.ndarray,
+    sizes: list[int],
+) -> np.ndarray:
+    # the columns hold each board's solutions side by side, shifting every
+    # board's codes into a range of its own lets one bincount cover them all
+    rows = patterns.shape[0]
+    bins = len(sizes) * PATTERN_COUNT
+    boards = np.repeat(np.arange(len(sizes), dtype=np.intp), sizes)
+    offsets = (
+        patterns.astype(np.intp)
+        + boards * PATTERN_COUNT
+        + np.arange(rows, dtype=np.intp)[:, None] * bins
+    )
+    counts = np.bincount(offsets.ravel(), minlength=rows * bins).reshape(
+        rows,
+        len(sizes),
+        PATTERN_COUNT,
+    )
+
+    # a board the guess solves has nothing left on it, rather than the one
+    # candidate a single game counts, so solving a board now is rewarded
+    squares = (counts * counts).sum(axis=2) - counts[:, :, PATTERN_COUNT - 1]
+    return (squares / np.asarray(sizes)).sum(axis=1)
+
+
+def avg_remaining_solutions_bounded(
+    patterns: np.ndarray,
+    bound: Bound,
+    *,
+    stages: int = 4,
+    seeds: int = 16,
+) -> tuple[np.ndarray, np.ndarray]:
+    rows, solution_count = patterns.shape
+    pruned = np.zeros(rows, dtype=bool)
+
+    if solution_count < MINIMUM_PRUNED_SOLUTIONS:
+        scores = avg_remaining_solutions(patterns)
+        if rows:
+            bound.offer(scores.min())
+        return scores, pruned
+
+    scores = np.empty(rows)
+    alive = np.arange(rows)
+    counts = np.zeros((rows, PATTERN_COUNT), dtype=np.int64)
+
+    edges = np.linspace(0, solution_count, stages + 1).astype(int).tolist()
+    for stage, (start, stop) in enumerate(zip(edges, edges[1:])):
+        # counts only holds rows for the guesses that are still alive
+        counts += bucket_sizes(patterns[alive, start:stop])
+        squares = (counts * counts).sum(axis=1)
+
+        if stop == solution_count:
+            scores[alive] = squares / solution_count
+            if len(alive):
+                bound.offer(scores[alive].min())
+            break
+
+        # every solution not yet counted adds at least 1 to the total
+        lower = (squares + (solution_count - stop)) / solution_count
+
+        if stage == 0 and len(alive):
+            seed = alive[np.argsort(lower, kind="stable")[:seeds]]
+            bound.offer(avg_remaining_solutions(patterns[seed]).min())
+
+        cut = lower > bound.value
+        scores[alive[cut]] = lower[cut]
+        pruned[alive[cut]] = True
+        alive = alive[~cut]
+        counts = counts[~cut]
+
+    return scores, pruned
+
+
+def heuristic_order(
+    table: PatternTable,
+    solution_ids: np.ndarray,
+    guess_ids: np.ndarray | None = None,
+) -> np.ndarray:
+    # guesses made of letters common among the remaining solutions (and in
+    # the same places) tend to split them well, so they are ranked first
+    if guess_ids is None:
+        guess_ids = np.arange(len(table.guesses))
+
+    solution_letters = table.solution_letters[solution_ids] - ord("A")
+    guess_letters = table.guess_letters[guess_ids] - ord("A")
+
+    present = np.zeros((len(solution_ids), 26), dtype=bool)
+    present[np.arange(len(solution_ids))[:, None], solution_letters] = True
+    letter_counts = present.sum(axis=0)
+
+    # repeated letters only cover the remaining solutions once
+    first = np.ones(guess_letters.shape, dtype=bool)
+    for i in range(1, 5):
+        first[:, i] = (guess_letters[:, :i] != guess_letters[:, i, None]).all(axis=1)
+
+    coverage = (letter_counts[guess_letters] * first).sum(axis=1)
+    for i in range(5):
+        position_counts = np.bincount(solution_letters[:, i], minlength=26)
+        coverage += position_counts[guess_letters[:, i]]
+
+    return guess_ids[np.argsort(-coverage, kind="stable")]
+
+
+def iter_avg_remaining_solutions(
+    table: PatternTable,
+    solution_ids: np.ndarray,
+    guess_ids: np.ndarray | None = None,
+    *,
+    bound: Bound | None = None,
+    chunk_size: int = 1024,
+    deadline: float | None = None,
+) -> Generator[tuple[str, float, bool], None, None]:
+    if guess_ids is None:
+        guess_ids = np.arange(len(table.guesses))
+
+    stats = instrumentation.active()
+    batch = chunk_size if deadline is None else MINIMUM_BATCH
+    start = 0
+    while start < len(guess_ids):
+        # the first batch holds the most promising guesses, so it is always
+        # scored, even when setup already used up the time
+        started_at = time.perf_counter()
+        if deadline is not None and start and started_at >= deadline:
+            return
+
+        chunk = guess_ids[start : start + batch]
+        start += len(chunk)
+        patterns = table.matrix[chunk][:, solution_ids]
+
+        if bound is None:
+            scores = avg_remaining_solutions(patterns)
+            pruned = np.zeros(len(chunk), dtype=bool)
+        else:
+            scores, pruned = avg_remaining_solutions_bounded(patterns, bound)
+
+        elapsed = time.perf_counter() - started_at
+        if stats is not None:
+            stats.count("guesses scored", len(chunk))
+            stats.count("guesses pruned", int(pruned.sum()))
+            stats.add_time("scoring", elapsed)
+
+        if deadline is not None and elapsed > 0:
+            # never plan a batch that would run past the deadline
+            seconds = min(BATCH_SECONDS, deadline - started_at - elapsed)
+            batch = int(
+                np.clip(seconds * len(chunk) / elapsed, MINIMUM_BATCH, chunk_size),
+            )
+
+        for guess_id, score, was_pruned in zip(
+            chunk.tolist(),
+            scores.tolist(),
+            pruned.tolist(),
+        ):
+            yield table.guesses[guess_id], score, was_pruned
+
+
+def schedule(
+    table: PatternTable,
+    guess_ids: np.ndarray,
+    submit: Callable[[np.ndarray], Future],
+    *,
+    in_flight: int,
+    batch_size: Callable[[], int],
+    finish: Callable[[np.ndarray, Any], tuple[np.ndarray, np.ndarray]],
+    deadline: float | None = None,
+    wait_timer: str | None = None,
+) -> Generator[tuple[str, float, bool], None, None]:
+    # the engines that score batches elsewhere share this loop, and only
+    # differ in how a batch is submitted and how its result is unpacked
+    stats = instrumentation.active()
+    futures: dict[Future, np.ndarray] = {}
+    position = 0
+    scored = False
+    try:
+        while position < len(guess_ids) or futures:
+            # batches go out in order, and only a few are queued at once
+            # so that earlier guesses are always scored first
+            while position < len(guess_ids) and len(futures) < in_flight:
+                chunk = guess_ids[position : position + batch_size()]
+                position += len(chunk)
+                futures[submit(chunk)] = chunk
+
+            # the deadline only applies once something has been scored
+            timeout = None
+            if deadline is not None and scored:
+                timeout = max(deadline - time.perf_counter(), 0)
+
+            waited_at = time.perf_counter()
+            done, _ = wait(futures, timeout, FIRST_COMPLETED)
+            if stats is not None and wait_timer is not None:
+                stats.add_time(wait_timer, time.perf_counter() - waited_at)
+            if not done:
+                return
+
+            for future in done:
+                chunk = futures.pop(future)
+                scores, pruned = finish(chunk, future.result())
+                scored = True
+
+                for guess_id, score, was_pruned in zip(
+                    chunk.tolist(),
+                    scores.tolist(),
+                    pruned.tolist(),
+                ):
+                    yield table.guesses[guess_id], score, was_pruned
+    finally:
+        for future in futures:
+            future.cancel()
@@ -0,0 +1,220 @@
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
+from typing import Any, Callable, Hashable
+
+from wordle import cache, feedback, game, grids, openings, pool
+
+History = tuple[tuple[str, int], ...]
+
+STATUS_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    500: "Internal Server Error",
+}
+
+
+def parse_history(data: dict) -> History:
+    history = []
+    for word, pattern in data.get("history", ()):
+        if isinstance(pattern, str):
+            pattern = feedback.parse(pattern)
+        elif not isinstance(pattern, int) or not 0 <= pattern < feedback.PATTERN_COUNT:
+            msg = f"{pattern!r} is not a feedback pattern."
+            raise ValueError(msg)
+
+        history.append((str(word).strip().upper(), pattern))
+
+    return tuple(history)
+
+
+class SolverService:
+    def __init__(
+        self,
+        *,
+        solver_pool: pool.SolverPool | None = None,
+        ranking_cache: cache.RankingCache | None = None,
+        threads: int | None = None,
+    ) -> None:
+        self.solver_pool = solver_pool
+        self.ranking_cache = ranking_cache
+        self._executor = ThreadPoolExecutor(threads)
+        self._in_flight: dict[Hashable, asyncio.Future] = {}
+
+    def warm(self) -> None:
+        feedback.default_table()
+        openings.initial_rankings()
+        grids.default_index()
+
+    def _game(self, history: History, **options: Any) -> game.Game:
+        return game.Game.from_history(
+            history,
+            solver_pool=self.solver_pool,
+            ranking_cache=self.ranking_cache,
+            **options,
+        )
+
+    def _rank(
+        self,
+        history: History,
+        timeout: float | None,
+        prune: bool,
+        hard_mode: bool,
+    ) -> dict:
+        g = self._game(history, hard_mode=hard_mode)
+        return asdict(g.get_guess_rankings(timeout, prune=prune))
+
+    def _best_guess(self, history: History, hard_mode: bool) -> dict:
+        g = self._game(history, pruning=True, hard_mode=hard_mode)
+        return {
+            "guess": g.best_guess,
+            "possible_solutions": len(g.possible_solutions),
+        }
+
+    async def _coalesced(self, key: Hashable, fn: Callable, *args: Any) -> Any:
+        # identical requests that arrive while one is running share its result
+        future = self._in_flight.get(key)
+        if future is None:
+            future = asyncio.get_running_loop().run_in_executor(
+                self._executor,
+                fn,
+                *args,
+            )
+            self._in_flight[key] = future
+            future.add_done_callback(lambda _: self._in_flight.pop(key, None))
+
+        return await asyncio.shield(future)
+
+    async def rank(
+        self,
+        history: History,
+        timeout: float | None = None,
+        prune: bool = False,
+        hard_mode: bool = False,
+    ) -> dict:
+        return await self._coalesced(
+            ("rank", history, timeout, prune, hard_mode),
+            self._rank,
+            history,
+            timeout,
+            prune,
+            hard_mode,
+        )
+
+    async def best_guess(self, history: History, hard_mode: bool = False) -> dict:
+        return await self._coalesced(
+            ("best", history, hard_mode),
+            self._best_guess,
+            history,
+            hard_mode,
+        )
+
+    async def _route(self, method: str, target: str, body: bytes) -> tuple[int, Any]:
+        if method == "GET" and target == "/health":
+            return 200, {"status": "ok"}
+
+        if method != "POST" or target not in ("/rank", "/best-guess", "/grids"):
+            return 404, {"error": f"No route for {method} {target}."}
+
+        try:
+            data = json.loads(body or b"{}")
+            if target == "/grids":
+                # the index lookup takes milliseconds, so it stays on the loop
+                return 200, {"solutions": grids.solutions(data.get("grids", ()))}
+
+            history = parse_history(data)
+            hard_mode = bool(data.get("hard_mode", False))
+            if target == "/rank":
+                return 200, await self.rank(
+                    history,
+                    data.get("timeout"),
+                    bool(data.get("prune", False)),
+                    hard_mode,
+                )
+
+            return 200, await self.best_guess(history, hard_mode)
+        except game.InvalidGuess as e:
+            return 400, {"error": e.reason}
+        except (ValueError, TypeError) as e:
+            return 400, {"error": str(e)}
+
+    async def handle(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+    ) -> None:
+        try:
+            while request_line := await reader.readline():
+                method, target, _ = request_line.decode("latin-1").split(" ", 2)
+
+                headers = {}
+                while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+
+                try:
+                    status, payload = await self._route(method, target, body)
+                except Exception as e:
+                    status, payload = 500, {"error": repr(e)}
+
+                content = json.dumps(payload).encode()
+                writer.write(
+                    f"HTTP/1.1 {status} {STATUS_REASONS[status]}\r\n"
+                    "Content-Type: application/json\r\n"
+                    f"Content-Length: {len(content)}\r\n"
+                    "\r\n".encode()
+                    + content,
+                )
+                await writer.drain()
+
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 8765,
+        unix_socket: str | None = None,
+    ) -> None:
+        if unix_socket:
+            server = await asyncio.start_unix_server(self.handle, path=unix_socket)
+        else:
+            server = await asyncio.start_server(self.handle, host, port)
+
+        async with server:
+            await server.serve_forever()
+
+
+def run(
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    unix_socket: str | None = None,
+    *,
+    ranking_cache: bool = True,
+) -> None:
+    solver_pool = None
+    if pool.default_processes() > 1:
+        solver_pool = pool.SolverPool(preload=(feedback.default_table(),))
+
+    service = SolverService(
+        solver_pool=solver_pool,
+        ranking_cache=cache.RankingCache() if ranking_cache else None,
+    )
+    service.warm()
+
+    print(f"Serving on {unix_socket or f'http://{host}:{port}'}")
+    try:
+        asyncio.run(service.serve(host, port, unix_socket))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if solver_pool is not None:
+            solver_pool.shutdown()
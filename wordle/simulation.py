@@ -0,0 +1,76 @@
+from collections import OrderedDict, defaultdict
+from typing import Any, Hashable, Iterable
+
+from wordle.game import Game
+
+
+class TranspositionTable:
+    def __init__(self, capacity: int = 100_000) -> None:
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[Hashable, str] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> str | None:
+        guess = self._entries.get(key)
+        if guess is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return guess
+
+    def put(self, key: Hashable, guess: str) -> None:
+        self._entries[key] = guess
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+
+def simulate_all(
+    solutions: Iterable[str],
+    *,
+    transpositions: TranspositionTable | None = None,
+    **game_options: Any,
+) -> dict[str, list[str]]:
+    if transpositions is None:
+        transpositions = TranspositionTable()
+
+    games = [Game(solution, **game_options) for solution in solutions]
+
+    active = games
+    while active:
+        # games with the same history are in the same state, so only
+        # one of them needs to work out which solutions remain
+        by_history: defaultdict[tuple[tuple[int, int], ...], list[Game]] = (
+            defaultdict(list)
+        )
+        for g in active:
+            by_history[g._history].append(g)
+
+        for group in by_history.values():
+            # in hard mode the guesses on offer (and the ones that are legal)
+            # depend on every hint so far, not just on the remaining solutions
+            if group[0].hard_mode:
+                state = frozenset(group[0]._possible_guesses)
+            else:
+                state = frozenset(group[0].possible_solutions)
+
+            guess = transpositions.get(state)
+            if guess is None:
+                guess = group[0].best_guess
+                transpositions.put(state, guess)
+
+            for g in group:
+                g.make_guess(guess)
+
+        active = [g for g in active if not g.won and not g.lost]
+
+    return {g._solution: [guess.word for guess in g.guesses] for g in games}
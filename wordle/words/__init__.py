@@ -1,43 +1,65 @@
-import json
+import hashlib
 from datetime import date, datetime
+from functools import cache
 from pathlib import Path
-
-import requests
-from tzlocal import get_localzone
+from typing import Any, Iterable
 
 directory = Path(__file__).parent
 
-with (directory / "solutions.txt").open() as f:
-    solutions_list = sorted(f.read().splitlines())
-    solutions = set(solutions_list)
+# these are read from disk the first time any of them is accessed
+solutions_list: list[str]
+solutions: set[str]
+non_solutions_list: list[str]
+non_solutions: set[str]
+all_words: set[str]
+all_words_list: list[str]
 
-with (directory / "non-solutions.txt").open() as f:
-    non_solutions_list = sorted(f.read().splitlines())
-    non_solutions = set(non_solutions_list)
 
-all_words = solutions | non_solutions
-all_words_list = sorted(all_words)
+@cache
+def _load() -> dict[str, Any]:
+    with (directory / "solutions.txt").open() as f:
+        solutions_list = sorted(f.read().splitlines())
+        solutions = set(solutions_list)
 
+    with (directory / "non-solutions.txt").open() as f:
+        non_solutions_list = sorted(f.read().splitlines())
+        non_solutions = set(non_solutions_list)
 
-def fetch_nyt_solution(day: date | None = None) -> str:
-    if day is None:
-        day = datetime.now(get_localzone()).date()
+    all_words = solutions | non_solutions
+    return {
+        "solutions_list": solutions_list,
+        "solutions": solutions,
+        "non_solutions_list": non_solutions_list,
+        "non_solutions": non_solutions,
+        "all_words": all_words,
+        "all_words_list": sorted(all_words),
+    }
+
+
+def __getattr__(name: str) -> Any:
+    if name in __annotations__:
+        return _load()[name]
+
+    msg = f"module {__name__!r} has no attribute {name!r}"
+    raise AttributeError(msg)
 
-    filename = f"{day.isoformat()}.json"
 
-    try:
-        with (directory / filename).open() as f:
-            return json.load(f)["solution"].strip().upper()
-    except Exception:
-        pass
+def digest(solutions: Iterable[str], non_solutions: Iterable[str]) -> str:
+    h = hashlib.sha256()
+    for group in (solutions, non_solutions):
+        h.update("\n".join(sorted(group)).encode())
+        h.update(b"\0")
 
-    data = requests.get(f"https://www.nytimes.com/svc/wordle/v2/{filename}").json()
-    solution = data["solution"]
+    return h.hexdigest()[:16]
 
-    try:
-        with (directory / filename).open("w") as f:
-            json.dump(data, f, indent=2)
-    except Exception:
-        pass
 
-    return solution.strip().upper()
+def fetch_nyt_solution(day: date | None = None) -> str:
+    # only needed when fetching, and slow to import
+    from tzlocal import get_localzone
+
+    from wordle import archive
+
+    if day is None:
+        day = datetime.now(get_localzone()).date()
+
+    return archive.solution(day)